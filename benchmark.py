@@ -0,0 +1,146 @@
+import argparse
+import collections
+import datetime
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import cache
+import days
+import generate_input
+
+PhaseTiming = collections.namedtuple("PhaseTiming", ["day", "phase", "times", "value"])
+
+def percentile(values, pct):
+    # nearest-rank percentile
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank-1]
+
+def summarise(timing, size=None):
+    return {
+        "day": timing.day,
+        "phase": timing.phase,
+        "size": size,
+        "runs": len(timing.times),
+        "min": min(timing.times),
+        "median": statistics.median(timing.times),
+        "p95": percentile(timing.times, 95),
+        "times": timing.times,
+        # parsed inputs are too large to be worth reporting
+        "value": None if timing.phase == "parse" else repr(timing.value),
+    }
+
+def time_phase(day, phase, path=None, repeat=5, warmup=1, disk_cache=None):
+    module = days.load_day(day)
+    spec = days.SPECS[day]
+    if path is None:
+        path = days.input_path(day)
+    func = getattr(spec, phase)
+    
+    times = []
+    with cache.use(disk_cache, day, path):
+        for i in range(warmup + repeat):
+            if phase == "parse":
+                arg = path
+            else:
+                # parts may mutate their input, so every run gets a fresh (untimed) parse
+                arg = spec.parse(module, path)
+            start = time.perf_counter()
+            value = func(module, arg)
+            end = time.perf_counter()
+            if i >= warmup:
+                times.append(end - start)
+    return PhaseTiming(day, phase, times, value)
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=days.ROOT,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+def run_benchmarks(day_list, phases=days.PHASES, path=None, repeat=5, warmup=1,
+                   sizes=None, seed=0, disk_cache=None):
+    """Yields (size, timing) for every day and phase.
+    With sizes, each day is timed on a generated input of each size,
+    otherwise size is None and path (or dayNN/input.txt) is used.
+    """
+    for day in day_list:
+        if not sizes:
+            for phase in phases:
+                yield None, time_phase(day, phase, path, repeat, warmup, disk_cache)
+            continue
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                size_path = os.path.join(tmp, "input.txt")
+                generate_input.write_input(day, size, size_path, seed)
+                for phase in phases:
+                    yield size, time_phase(day, phase, size_path, repeat, warmup, disk_cache)
+
+def format_row(summary):
+    size = "" if summary["size"] is None else f" size {summary['size']:<8}"
+    return (f"day{summary['day']:02}{size} {summary['phase']:<6}"
+            f" min {summary['min']:10.6f}s"
+            f" median {summary['median']:10.6f}s"
+            f" p95 {summary['p95']:10.6f}s"
+            f" ({summary['runs']} runs)"
+            + ("" if summary["value"] is None else f" -> {summary['value']}"))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time parse/part1/part2 of each day.")
+    parser.add_argument("days", nargs="*", type=int, default=list(days.ALL_DAYS))
+    parser.add_argument("--phases", nargs="+", choices=days.PHASES, default=list(days.PHASES))
+    parser.add_argument("--input", help="input file to use instead of dayNN/input.txt")
+    parser.add_argument("--sizes", nargs="+", type=int,
+                        help="time on generated inputs of these sizes instead")
+    parser.add_argument("--seed", type=int, default=0, help="seed for generated inputs")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--cache", action="store_true",
+                        help="reuse cached intermediates (see cache.py), timing the warm path")
+    parser.add_argument("--json", help="write results as JSON to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+    
+    if args.input and len(args.days) != 1:
+        parser.error("--input requires exactly one day")
+    if args.input and args.sizes:
+        parser.error("--input and --sizes are mutually exclusive")
+    
+    results = []
+    benchmarks = run_benchmarks(args.days, args.phases, args.input, args.repeat, args.warmup,
+                                args.sizes, args.seed,
+                                cache.DiskCache() if args.cache else None)
+    for size, timing in benchmarks:
+        summary = summarise(timing, size)
+        results.append(summary)
+        if args.json != "-":
+            print(format_row(summary), flush=True)
+    
+    if args.json:
+        report = {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "seed": args.seed if args.sizes else None,
+            "cache": args.cache,
+            "results": results,
+        }
+        if args.json == "-":
+            json.dump(report, sys.stdout, indent=2)
+            print()
+        else:
+            with open(args.json, "w") as f:
+                json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
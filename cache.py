@@ -0,0 +1,129 @@
+import contextlib
+import hashlib
+import os
+import pickle
+import tempfile
+import zlib
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DIR = os.environ.get("AOC_CACHE_DIR", os.path.join(ROOT, ".cache"))
+DEFAULT_MAX_BYTES = 256 * 1024**2
+# bump to invalidate every cache entry, e.g. when the file format changes
+FORMAT_VERSION = 1
+
+class DiskCache:
+    """Directory of zlib-compressed pickles, evicted least recently used
+    first once it grows over max_bytes. Writes are atomic, so several
+    processes can share a directory.
+    """
+    def __init__(self, directory=DEFAULT_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+    
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.pickle.z")
+    
+    def load(self, key):
+        """Returns (True, value) on a hit, (False, None) on a miss."""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.loads(zlib.decompress(f.read()))
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError, AttributeError):
+            return False, None
+        with contextlib.suppress(OSError):
+            os.utime(path) # mtime doubles as last use for eviction
+        return True, value
+    
+    def store(self, key, value):
+        os.makedirs(self.directory, exist_ok=True)
+        data = zlib.compress(pickle.dumps(value, pickle.HIGHEST_PROTOCOL), 1)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            # a leftover .tmp file would never be counted or evicted
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+    
+    def entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".pickle.z"):
+                    # another process may evict it between the scan and the stat
+                    with contextlib.suppress(FileNotFoundError):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+    
+    def evict(self):
+        entries = sorted(self.entries())
+        total = sum(size for mtime, size, path in entries)
+        for mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                os.remove(path)
+            total -= size
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    if path is not None:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024**2), b""):
+                digest.update(chunk)
+    return digest
+
+def code_version(day):
+    """Hash of the code an intermediate can depend on: the day's module and days.py."""
+    digest = hashlib.sha256(str(FORMAT_VERSION).encode())
+    for path in (os.path.join(ROOT, f"day{day:02}", "main.py"), os.path.join(ROOT, "days.py")):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+class InputCache:
+    """Intermediates computed from one input of one day."""
+    def __init__(self, disk_cache, day, path):
+        digest = file_digest(path)
+        digest.update(code_version(day).encode())
+        self.disk_cache = disk_cache
+        self.day = day
+        self.digest = digest.hexdigest()
+    
+    def get(self, name, compute):
+        key = f"day{self.day:02}-{name}-{self.digest}"
+        hit, value = self.disk_cache.load(key)
+        if not hit:
+            value = compute()
+            self.disk_cache.store(key, value)
+        return value
+
+current = None
+
+@contextlib.contextmanager
+def use(disk_cache, day, path):
+    """Makes cached() use disk_cache for this input of this day.
+    Does nothing if disk_cache is None.
+    """
+    global current
+    if disk_cache is None:
+        yield
+        return
+    previous = current
+    current = InputCache(disk_cache, day, path)
+    try:
+        yield current
+    finally:
+        current = previous
+
+def cached(name, compute):
+    """compute(), or its stored result from a previous run on the same input."""
+    if current is None:
+        return compute()
+    return current.get(name, compute)
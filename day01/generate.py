@@ -0,0 +1,26 @@
+import itertools
+import random
+
+TARGET = 2020
+
+def has_extra_sum(planted):
+    pairs = sum(1 for c in itertools.combinations(planted, 2) if sum(c) == TARGET)
+    triplets = sum(1 for c in itertools.combinations(planted, 3) if sum(c) == TARGET)
+    return pairs != 1 or triplets != 1
+
+def generate(size, seed=None):
+    """size expenses with exactly one pair and one triplet summing to 2020.
+    Every other expense is larger than 2020 so it can never be part of a sum.
+    """
+    rng = random.Random(seed)
+    while True:
+        x = rng.randint(1, TARGET-1)
+        y1 = rng.randint(1, TARGET-2)
+        y2 = rng.randint(1, TARGET-1-y1)
+        planted = [x, TARGET-x, y1, y2, TARGET-y1-y2]
+        if not has_extra_sum(planted):
+            break
+    filler_count = max(size - len(planted), 0)
+    expenses = planted + [rng.randint(TARGET+1, 100*TARGET) for _ in range(filler_count)]
+    rng.shuffle(expenses)
+    return "".join(f"{x}\n" for x in expenses)
@@ -1,27 +1,121 @@
+import bisect
 import collections
 import time
 
+def two_sum(nums, start, target):
+    """Two pointers over sorted nums[start:]."""
+    lo = start
+    hi = len(nums) - 1
+    while lo < hi:
+        total = nums[lo] + nums[hi]
+        if total == target:
+            return (nums[lo], nums[hi])
+        if total < target:
+            lo += 1
+        else:
+            hi -= 1
+    return None
+
+def sorted_k_sum(nums, start, target, k):
+    if k == 1:
+        i = bisect.bisect_left(nums, target, start)
+        if i < len(nums) and nums[i] == target:
+            return (target,)
+        return None
+    if k == 2:
+        return two_sum(nums, start, target)
+    last = len(nums) - k
+    for i in range(start, last + 1):
+        x = nums[i]
+        if i > start and x == nums[i-1]:
+            continue # same first value, same result
+        if x * k > target:
+            break # all the rest are >= x
+        if x + nums[-1] * (k-1) < target:
+            continue
+        rest = sorted_k_sum(nums, i + 1, target - x, k - 1)
+        if rest is not None:
+            return (x,) + rest
+    return None
+
+def find_k_sum(nums, target, k):
+    """k entries of nums (each used at most once) summing to target, in
+    ascending order, or None. O(n^(k-1)), O(n log n) for k <= 2.
+    """
+    if k < 0:
+        raise ValueError(f"k must be >= 0, got {k}")
+    if k == 0:
+        return () if target == 0 else None
+    return sorted_k_sum(sorted(nums), 0, target, k)
+
+class ExpenseIndex:
+    """Numbers indexed once for many pair/triplet sum queries.
+    Tuples are of values in ascending order, each value used at most as
+    many times as it appears. With pair_index, every pair sum is indexed
+    up front (O(u^2) for u distinct values), which makes pair queries O(1)
+    and triplet queries O(u) plus the number of matches.
+    """
+    def __init__(self, nums, pair_index=False):
+        self.counts = collections.Counter(nums)
+        self.values = sorted(self.counts)
+        self.pair_sums = None
+        if pair_index:
+            self.pair_sums = collections.defaultdict(list)
+            for i, a in enumerate(self.values):
+                if self.counts[a] >= 2:
+                    self.pair_sums[2*a].append((a, a))
+                for b in self.values[i+1:]:
+                    self.pair_sums[a+b].append((a, b))
+    
+    def iter_pairs(self, target):
+        if self.pair_sums is not None:
+            yield from self.pair_sums.get(target, ())
+            return
+        counts = self.counts
+        for a in self.values:
+            b = target - a
+            if b < a:
+                break
+            if b in counts and (a != b or counts[a] >= 2):
+                yield (a, b)
+    
+    def iter_triplets(self, target):
+        counts = self.counts
+        for a in self.values:
+            if 3*a > target:
+                break
+            for b, c in self.iter_pairs(target - a):
+                if b < a:
+                    continue
+                # a <= b <= c, and b, c already fit their counts as a pair
+                if a == b and counts[a] < (3 if b == c else 2):
+                    continue
+                yield (a, b, c)
+    
+    def find_all(self, target, k):
+        if k == 2:
+            return list(self.iter_pairs(target))
+        if k == 3:
+            return list(self.iter_triplets(target))
+        raise ValueError(f"k must be 2 or 3, got {k}")
+    
+    def find_first(self, target, k):
+        if k == 2:
+            return next(self.iter_pairs(target), None)
+        if k == 3:
+            return next(self.iter_triplets(target), None)
+        raise ValueError(f"k must be 2 or 3, got {k}")
+    
+    def query(self, targets, k, first=False):
+        """{target: first tuple or None} if first, else {target: [all tuples]}."""
+        find = self.find_first if first else self.find_all
+        return {target: find(target, k) for target in targets}
+
 def get_2020_pair(nums):
-    nums = collections.Counter(nums)
-    for x in nums:
-        other_required = 2020 - x
-        if other_required in nums:
-            if x == other_required and nums[x] < 2:
-                continue
-            return (x, other_required)
+    return find_k_sum(nums, 2020, 2)
 
 def get_2020_triplet(nums):
-    nums = collections.Counter(nums)
-    for x1 in nums:
-        for x2 in nums:
-            other_required = 2020 - x1 - x2
-            if other_required not in nums:
-                continue
-            triplet = (x1, x2, other_required)
-            triplet_multiset = collections.Counter(triplet)
-            if (triplet_multiset & nums) != triplet_multiset:
-                continue
-            return (x1, x2, other_required)
+    return find_k_sum(nums, 2020, 3)
 
 if __name__ == "__main__":
     start = time.time()
@@ -0,0 +1,15 @@
+import random
+import string
+
+def generate(size, seed=None, max_length=20):
+    rng = random.Random(seed)
+    lines = []
+    for i in range(size):
+        letter = rng.choice(string.ascii_lowercase)
+        length = rng.randint(3, max_length)
+        first = rng.randint(1, length-1)
+        second = rng.randint(first+1, length)
+        alphabet = letter*3 + string.ascii_lowercase
+        password = "".join(rng.choice(alphabet) for _ in range(length))
+        lines.append(f"{first}-{second} {letter}: {password}\n")
+    return "".join(lines)
@@ -1,4 +1,8 @@
-import collections
+import array
+import concurrent.futures
+import itertools
+import os
+import sys
 import time
 
 class PasswordEntry:
@@ -24,19 +28,105 @@ class PasswordEntry:
                 )
         return count == 1
 
+class PasswordColumns:
+    """A whole password file as columns: policy numbers and letter codes in
+    arrays, and the passwords joined by newlines into one bytes buffer,
+    instead of one PasswordEntry per line. Password i is
+    buffer[starts[i]:starts[i+1]-1].
+    """
+    def __init__(self, data):
+        # every line is 3 tokens: "1-3" "a:" "abcde"
+        tokens = bytes(data).split()
+        passwords = tokens[2::3]
+        letters = b"".join(tokens[1::3])
+        if len(tokens) % 3 or len(letters) != 2 * len(passwords):
+            raise ValueError("malformed password file")
+        bounds = array.array("q", map(int, b" ".join(tokens[0::3]).replace(b"-", b" ").split()))
+        self.firsts = bounds[0::2]
+        self.seconds = bounds[1::2]
+        self.letters = array.array("B", letters[0::2])
+        self.buffer = b"\n".join(passwords) + b"\n"
+        lengths = map(len, passwords)
+        self.starts = array.array("q", itertools.accumulate(map((1).__add__, lengths), initial=0))
+    
+    def __len__(self):
+        return len(self.letters)
+    
+    def count_valid1(self):
+        count = self.buffer.count
+        # the separating newline never matches a letter, so it can be counted in
+        return sum(first <= count(letter, start, end) <= second
+                   for first, second, letter, start, end
+                   in zip(self.firsts, self.seconds, self.letters, self.starts, self.starts[1:]))
+    
+    def count_valid2(self):
+        starts = self.starts
+        for i, (first, second) in enumerate(zip(self.firsts, self.seconds)):
+            length = starts[i+1] - starts[i] - 1
+            # an out of range position would read the next password instead
+            if not (1 <= first <= length and 1 <= second <= length):
+                raise IndexError(f"positions {first}-{second} out of range for password {i}")
+        buffer = self.buffer
+        return sum((buffer[start+first-1] == letter) != (buffer[start+second-1] == letter)
+                   for first, second, letter, start
+                   in zip(self.firsts, self.seconds, self.letters, starts))
+
+def line_aligned_ranges(path, chunk_size):
+    """(start, end) byte ranges of about chunk_size covering the file, each
+    ending just after a newline (or at the end of the file).
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_size, size) - 1)
+            f.readline()
+            end = min(f.tell(), size)
+            yield start, end
+            start = end
+
+def count_valid_range(path, start, end):
+    with open(path, "rb") as f:
+        f.seek(start)
+        passwords = PasswordColumns(f.read(end - start))
+    return passwords.count_valid1(), passwords.count_valid2()
+
+def count_valid_file(path, chunk_size=64*1024**2, max_workers=None):
+    """(part1, part2) counts of a password file of any size, validated in
+    chunks across a process pool. Each worker holds one chunk at a time.
+    """
+    ranges = list(line_aligned_ranges(path, chunk_size))
+    total1 = total2 = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(count_valid_range, path, start, end) for start, end in ranges]
+        for future in concurrent.futures.as_completed(futures):
+            valid1, valid2 = future.result()
+            total1 += valid1
+            total2 += valid2
+    return total1, total2
+
 if __name__ == "__main__":
     start = time.time()
     
-    with open("input.txt") as f:
-        password_list = [PasswordEntry(line) for line in f.readlines()]
+    if len(sys.argv) > 1:
+        # big password file: validate it in chunks across processes
+        total_correct1, total_correct2 = count_valid_file(sys.argv[1])
+        print(f"part1: {total_correct1}")
+        print(f"part2: {total_correct2}")
+        end = time.time()
+        print(f"Took {end - start}s")
+        sys.exit()
+    
+    with open("input.txt", "rb") as f:
+        passwords = PasswordColumns(f.read())
     
     end = time.time()
     print(f"Took {end - start}s")
     
-    total_correct = sum(password.validate1() for password in password_list)
+    total_correct = passwords.count_valid1()
     print(f"part1: {total_correct}")
     
-    total_correct = sum(password.validate2() for password in password_list)
+    total_correct = passwords.count_valid2()
     print(f"part2: {total_correct}")
     
     end = time.time()
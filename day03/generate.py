@@ -0,0 +1,10 @@
+import random
+
+def generate(size, seed=None, width=31, density=0.2):
+    """size rows of width columns."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(size):
+        row = "".join("#" if rng.random() < density else "." for _ in range(width))
+        lines.append(row + "\n")
+    return "".join(lines)
@@ -1,4 +1,6 @@
 import collections
+import math
+import mmap
 import time
 
 Coord = collections.namedtuple("Coord", ["row","col"])
@@ -22,6 +24,82 @@ def count_trees(map, slope):
             count += 1
     return count
 
+class MappedMap:
+    """A map file of fixed-width rows, memory-mapped. Row offsets are
+    computed from the width of the first row, so indexing reads only that
+    row from the file, and count_trees only touches the rows a slope visits.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.buffer = None
+    
+    def __enter__(self):
+        self.file = open(self.path, "rb")
+        try:
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file
+            self.buffer = b""
+        if hasattr(self.buffer, "madvise"):
+            # steep slopes skip rows, read-ahead would fetch them anyway
+            self.buffer.madvise(mmap.MADV_RANDOM)
+        self.width = self.buffer.find(b"\n")
+        if self.width == -1:
+            self.width = len(self.buffer)
+        self.stride = self.width + 1
+        if self.width and self.buffer[self.width-1] == ord("\r"):
+            self.width -= 1
+        return self
+    
+    def __exit__(self, *exc_info):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self.buffer = None
+        self.file.close()
+    
+    def __len__(self):
+        if not self.buffer:
+            return 0
+        return (len(self.buffer) + self.stride - 1) // self.stride
+    
+    def __getitem__(self, row):
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        start = row * self.stride
+        return str(self.buffer[start:start+self.width], "ascii")
+
+TREE_BITS = str.maketrans(".#", "01")
+
+def row_mask(row):
+    """The row as an int with bit c set if there is a tree in column c."""
+    return int(row[::-1].translate(TREE_BITS), 2)
+
+def count_trees_many(map, slopes):
+    """Tree counts for every slope, in one pass over the rows."""
+    width = len(map[0])
+    counts = [0] * len(slopes)
+    cols = [0] * len(slopes)
+    by_row_step = collections.defaultdict(list)
+    for i, slope in enumerate(slopes):
+        by_row_step[slope.row].append(i)
+    if not by_row_step:
+        return counts
+    # only rows some slope can land on
+    row_stride = math.gcd(*by_row_step)
+    by_row_step = list(by_row_step.items())
+    for r in range(0, len(map), row_stride):
+        mask = None
+        for row_step, indices in by_row_step:
+            if r % row_step:
+                continue
+            if mask is None:
+                mask = row_mask(map[r])
+            for i in indices:
+                counts[i] += (mask >> cols[i]) & 1
+                cols[i] = (cols[i] + slopes[i].col) % width
+    return counts
+
 if __name__ == "__main__":
     start = time.time()
     
@@ -31,9 +109,9 @@ if __name__ == "__main__":
     tree_count13 = count_trees(map, Coord(1,3))
     print(f"part1: count: {tree_count13}")
     
-    tree_count_total = tree_count13
-    for slope in [Coord(1,1), Coord(1,5), Coord(1,7), Coord(2,1)]:
-        tree_count_total *= count_trees(map, slope)
+    tree_count_total = 1
+    for tree_count in count_trees_many(map, [Coord(1,1), Coord(1,3), Coord(1,5), Coord(1,7), Coord(2,1)]):
+        tree_count_total *= tree_count
     print(f"part2: count: {tree_count_total}")
     
     end = time.time()
@@ -0,0 +1,60 @@
+import random
+
+EYE_COLORS = ("amb","blu","brn","gry","grn","hzl","oth")
+
+def valid_fields(rng):
+    if rng.random() < 0.5:
+        hgt = f"{rng.randint(150, 193)}cm"
+    else:
+        hgt = f"{rng.randint(59, 76)}in"
+    return {
+        "byr": str(rng.randint(1920, 2002)),
+        "iyr": str(rng.randint(2010, 2020)),
+        "eyr": str(rng.randint(2020, 2030)),
+        "hgt": hgt,
+        "hcl": "#" + "".join(rng.choice("0123456789abcdef") for _ in range(6)),
+        "ecl": rng.choice(EYE_COLORS),
+        "pid": "".join(rng.choice("0123456789") for _ in range(9)),
+        "cid": str(rng.randint(1, 350)),
+    }
+
+def invalid_value(rng, field):
+    invalid = {
+        "byr": lambda: str(rng.choice([rng.randint(1900, 1919), rng.randint(2003, 2030)])),
+        "iyr": lambda: str(rng.choice([rng.randint(2000, 2009), rng.randint(2021, 2030)])),
+        "eyr": lambda: str(rng.choice([rng.randint(2000, 2019), rng.randint(2031, 2040)])),
+        "hgt": lambda: rng.choice([f"{rng.randint(194, 250)}cm", f"{rng.randint(77, 99)}in",
+                                   str(rng.randint(59, 193))]),
+        "hcl": lambda: rng.choice(["#" + "".join(rng.choice("ghijklmnz") for _ in range(6)),
+                                   "".join(rng.choice("0123456789abcdef") for _ in range(6))]),
+        "ecl": lambda: rng.choice(["xry", "zzz", "lzr", "gmt"]),
+        "pid": lambda: "".join(rng.choice("0123456789") for _ in range(rng.choice([8, 10]))),
+    }
+    return invalid[field]()
+
+def generate(size, seed=None):
+    """size passports: roughly half fully valid, a quarter with a missing
+    field and a quarter with one invalid field.
+    """
+    rng = random.Random(seed)
+    blocks = []
+    for i in range(size):
+        passport = valid_fields(rng)
+        kind = rng.random()
+        if kind < 0.25:
+            del passport[rng.choice(list(passport.keys() - {"cid"}))]
+        elif kind < 0.5:
+            field = rng.choice(list(passport.keys() - {"cid"}))
+            passport[field] = invalid_value(rng, field)
+        if rng.random() < 0.5:
+            del passport["cid"]
+        
+        fields = [f"{k}:{v}" for k, v in passport.items()]
+        rng.shuffle(fields)
+        lines = []
+        while fields:
+            take = rng.randint(1, 4)
+            lines.append(" ".join(fields[:take]))
+            fields = fields[take:]
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks) + "\n"
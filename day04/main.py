@@ -1,64 +1,136 @@
+import collections
+import functools
 import re
 import time
 
+def parse_passport(block):
+    fields = (field.split(":") for field in block.split())
+    return {field[0]:field[1] for field in fields}
+
 def extract_passports(rawfile):
     data = rawfile.split("\n\n")
     passports = []
     for block in data:
-        fields = (field.split(":") for field in block.split())
-        passport = {field[0]:field[1] for field in fields}
-        passports.append(passport)
+        passports.append(parse_passport(block))
     return passports
 
+def iter_passports(lines):
+    """Passports from an iterable of lines (e.g. an open file), one block at
+    a time, so only the current passport is in memory.
+    """
+    passport = {}
+    for line in lines:
+        if not line.strip():
+            if passport:
+                yield passport
+                passport = {}
+            continue
+        passport.update(parse_passport(line))
+    if passport:
+        yield passport
+
 def is_all_fields_present(passport):
     required_fields = {"byr","iyr","eyr","hgt","hcl","ecl","pid"}
     return required_fields <= passport.keys()
 
-def is_valid_fields(passport):
+Range = collections.namedtuple("Range", ["low", "high"])
+UnitRange = collections.namedtuple("UnitRange", ["ranges"]) # {unit suffix: Range}
+OneOf = collections.namedtuple("OneOf", ["values"])
+Pattern = collections.namedtuple("Pattern", ["regex"])
+
+PASSPORT_SCHEMA = {
+    "byr": Range(1920, 2002),
+    "iyr": Range(2010, 2020),
+    "eyr": Range(2020, 2030),
+    "hgt": UnitRange({"cm": Range(150, 193), "in": Range(59, 76)}),
+    "hcl": Pattern("#[0-9a-f]{6}"),
+    "ecl": OneOf({"amb","blu","brn","gry","grn","hzl","oth"}),
+    "pid": Pattern("[0-9]{9}"),
+}
+
+# ranges up to this long get a lookup set of their canonical spellings
+MAX_LOOKUP_RANGE = 10000
+
+def range_spellings(rule, suffix=""):
+    if rule.high - rule.low > MAX_LOOKUP_RANGE:
+        return frozenset()
+    return frozenset(f"{n}{suffix}" for n in range(rule.low, rule.high + 1))
+
+def check_range(rule, value):
+    # "+1950", "01950"... are still ints
     try:
-        byr = int(passport["byr"])
-        if not (1920 <= byr <= 2002):
-            return False
-        
-        iyr = int(passport["iyr"])
-        if not (2010 <= iyr <= 2020):
-            return False
-        
-        eyr = int(passport["eyr"])
-        if not (2020 <= eyr <= 2030):
-            return False
-        
-        hgt = int(passport["hgt"][:-2])
-        if (not (passport["hgt"].endswith("cm") and (150 <= hgt <= 193))
-            and not (passport["hgt"].endswith("in") and (59 <= hgt <= 76))):
-            return False
+        return rule.low <= int(value) <= rule.high
     except ValueError:
         return False
-    
-    if not re.fullmatch("#[0-9a-f]{6}", passport["hcl"]):
-        return False
-    
-    if passport["ecl"] not in ("amb","blu","brn","gry","grn","hzl","oth"):
-        return False
-    
-    if not (passport["pid"].isdigit() and len(passport["pid"]) == 9):
-        return False
-    
-    return True
+
+def compile_rule(rule):
+    """(set of values known to be valid, check for the other values or None)."""
+    if isinstance(rule, Range):
+        return range_spellings(rule), functools.partial(check_range, rule)
+    if isinstance(rule, UnitRange):
+        spellings = frozenset().union(*(range_spellings(r, unit) for unit, r in rule.ranges.items()))
+        pattern = re.compile("(.*)(" + "|".join(map(re.escape, rule.ranges)) + ")", re.DOTALL)
+        def check(value):
+            match = pattern.fullmatch(value)
+            return match is not None and check_range(rule.ranges[match[2]], match[1])
+        return spellings, check
+    if isinstance(rule, OneOf):
+        return frozenset(rule.values), None
+    if isinstance(rule, Pattern):
+        fullmatch = re.compile(rule.regex).fullmatch
+        return frozenset(), lambda value: fullmatch(value) is not None
+    raise TypeError(f"unknown rule {rule!r}")
+
+def compile_schema(schema):
+    """Validator for a {field: rule} schema. A passport is valid when every
+    field of the schema is present and passes its rule; other fields are ignored.
+    Most valid values are found in a lookup set, the rest go through a check.
+    """
+    checks = [(field, *compile_rule(rule)) for field, rule in schema.items()]
+    def validate(passport):
+        for field, spellings, check in checks:
+            value = passport.get(field)
+            if value in spellings:
+                continue
+            if value is None or check is None or not check(value):
+                return False
+        return True
+    return validate
+
+is_valid_fields = compile_schema(PASSPORT_SCHEMA)
+
+def validate_many(passports, validate=None):
+    """validate(passport) for every passport, as a list of bools.
+    validate defaults to is_valid_fields, looked up at call time.
+    """
+    if validate is None:
+        validate = is_valid_fields
+    return list(map(validate, passports))
+
+def is_valid_passport(passport):
+    return is_all_fields_present(passport) and is_valid_fields(passport)
+
+def iter_valid_passports(lines, validate=is_valid_passport):
+    """Passports from lines that pass validate, the rest are dropped as they are read."""
+    return filter(validate, iter_passports(lines))
+
+def count_valid_passports(lines):
+    """(all fields present, all fields valid) counts in one streaming pass."""
+    present = valid = 0
+    for passport in iter_passports(lines):
+        if is_all_fields_present(passport):
+            present += 1
+            valid += is_valid_fields(passport)
+    return present, valid
 
 if __name__ == "__main__":
     start = time.time()
     
     with open("input.txt") as f:
-        rawfile = f.read().strip()
-    
-    passports = extract_passports(rawfile)
-    
-    valid_passports = [p for p in passports if is_all_fields_present(p)]
-    print(f"part1: valid_passports: {len(valid_passports)}")
+        present, valid = count_valid_passports(f)
     
-    valid_passports = [p for p in valid_passports if is_valid_fields(p)]
-    print(f"part2: valid_passports: {len(valid_passports)}")
+    print(f"part1: valid_passports: {present}")
+    print(f"part2: valid_passports: {valid}")
     
     end = time.time()
     print(f"Took {end - start}s")
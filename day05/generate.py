@@ -0,0 +1,21 @@
+import random
+
+def encode(seat, row_bits, col_bits):
+    binary = format(seat, f"0{row_bits+col_bits}b")
+    rows = binary[:row_bits].translate(str.maketrans("01", "FB"))
+    cols = binary[row_bits:].translate(str.maketrans("01", "LR"))
+    return rows + cols
+
+def generate(size, seed=None):
+    """size boarding passes with consecutive seat ids and a single missing seat.
+    Passes get longer than the usual 10 characters when 1024 seats are not enough.
+    """
+    rng = random.Random(seed)
+    size = max(size, 2)
+    col_bits = 3
+    row_bits = max(7, (size+1).bit_length() - col_bits)
+    first = rng.randint(1, max(2**(row_bits+col_bits) - size - 2, 1))
+    seats = list(range(first, first+size+1))
+    seats.pop(rng.randint(1, size-1))
+    rng.shuffle(seats)
+    return "".join(encode(s, row_bits, col_bits) + "\n" for s in seats)
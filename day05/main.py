@@ -1,3 +1,4 @@
+import itertools
 import time
 
 translation = str.maketrans({"F":"0", "B":"1", "L":"0", "R":"1"})
@@ -6,21 +7,38 @@ def seat_id(line):
     binary_line = line.translate(translation)
     return int(binary_line,2)
 
+bulk_translation = bytes.maketrans(b"FBLR", b"0101")
+
+def seat_ids(data):
+    """Seat ids of every pass in the bytes of a whole file."""
+    return list(map(int, data.translate(bulk_translation).split(), itertools.repeat(2)))
+
+def find_gaps(seat_ids):
+    """Every seat id between the lowest and highest that is not in seat_ids."""
+    if not seat_ids:
+        return []
+    low = min(seat_ids)
+    seen = bytearray(max(seat_ids) - low + 1)
+    for s in seat_ids:
+        seen[s-low] = 1
+    gaps = []
+    i = seen.find(0)
+    while i != -1:
+        gaps.append(low + i)
+        i = seen.find(0, i+1)
+    return gaps
+
 if __name__ == "__main__":
     start = time.time()
     
-    with open("input.txt") as f:
-        seats = f.readlines()
-    
-    all_seats = {seat_id(s) for s in seats}
+    with open("input.txt", "rb") as f:
+        all_seats = seat_ids(f.read())
     
     max_seat = max(all_seats)
     print(f"part1: max_seat: {max_seat}")
     
-    min_seat = min(all_seats)
-    for seat_id in range(min_seat, max_seat+1):
-        if seat_id not in all_seats:
-            print(f"part2: missing seat: {seat_id}")
+    for seat in find_gaps(all_seats):
+        print(f"part2: missing seat: {seat}")
     
     end = time.time()
     print(f"Took {end - start}s")
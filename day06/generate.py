@@ -0,0 +1,18 @@
+import random
+import string
+
+def generate(size, seed=None, max_group_size=5):
+    """size groups of 1 to max_group_size people."""
+    rng = random.Random(seed)
+    groups = []
+    for i in range(size):
+        common = rng.sample(string.ascii_lowercase, rng.randint(0, 5))
+        people = []
+        for j in range(rng.randint(1, max_group_size)):
+            extra = rng.sample(string.ascii_lowercase, rng.randint(0, 8))
+            answers = set(common).union(extra) or set(rng.choice(string.ascii_lowercase))
+            answers = list(answers)
+            rng.shuffle(answers)
+            people.append("".join(answers))
+        groups.append("\n".join(people))
+    return "\n\n".join(groups) + "\n"
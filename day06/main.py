@@ -1,3 +1,5 @@
+import functools
+import operator
 import time
 
 def extract_groups(rawfile):
@@ -8,17 +10,39 @@ def extract_groups(rawfile):
         groups.append(group)
     return groups
 
+letter_bits = {chr(ord("a")+i): 1 << i for i in range(26)}
+
+def person_mask(person):
+    """The person's answers as a 26 bit int, bit i for the i-th letter."""
+    return functools.reduce(operator.or_, map(letter_bits.__getitem__, person), 0)
+
+all_letters = (1 << 26) - 1
+
+def count_any(masks):
+    return functools.reduce(operator.or_, masks, 0).bit_count()
+
+def count_all(masks):
+    masks = list(masks)
+    if not masks:
+        return 0 # nobody in the group, so no answers in common
+    return functools.reduce(operator.and_, masks, all_letters).bit_count()
+
 def group_count_any(group):
-    answers = set(group[0])
-    for person in group:
-        answers.update(person)
-    return len(answers)
+    return count_any(map(person_mask, group))
 
 def group_count_all(group):
-    answers = set(group[0])
-    for person in group:
-        answers.intersection_update(person)
-    return len(answers)
+    return count_all(map(person_mask, group))
+
+def count_answers(rawfile):
+    """(part1, part2) sums over all groups, in one pass over the file."""
+    total_any = total_all = 0
+    for group in rawfile.split("\n\n"):
+        if not group.strip():
+            continue
+        masks = list(map(person_mask, group.split()))
+        total_any += count_any(masks)
+        total_all += count_all(masks)
+    return total_any, total_all
 
 if __name__ == "__main__":
     start = time.time()
@@ -26,13 +50,9 @@ if __name__ == "__main__":
     with open("input.txt") as f:
         rawfile = f.read().strip()
     
-    groups = extract_groups(rawfile)
-    
-    group_count = sum(group_count_any(g) for g in groups)
-    print(f"part1: group_count: {group_count}")
-    
-    group_count = sum(group_count_all(g) for g in groups)
-    print(f"part2: group_count: {group_count}")
+    total_any, total_all = count_answers(rawfile)
+    print(f"part1: group_count: {total_any}")
+    print(f"part2: group_count: {total_all}")
     
     end = time.time()
     print(f"Took {end - start}s")
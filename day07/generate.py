@@ -0,0 +1,48 @@
+import random
+
+ADJECTIVES = ("bright","clear","dark","dim","dotted","drab","dull","faded","light","mirrored",
+              "muted","pale","plaid","posh","striped","vibrant","wavy","dusky","shiny")
+COLORS = ("aqua","beige","black","blue","bronze","brown","chartreuse","coral","crimson","cyan",
+          "fuchsia","gold","gray","green","indigo","lavender","lime","magenta","maroon","olive",
+          "orange","plum","purple","red","salmon","silver","tan","teal","tomato","turquoise",
+          "violet","white","yellow")
+TARGET = "shiny gold"
+
+def color_names(count, rng):
+    names = [f"{a} {c}" for a in ADJECTIVES for c in COLORS if f"{a} {c}" != TARGET]
+    suffix = 2
+    while len(names) < count-1:
+        names.extend(f"{a}{suffix} {c}" for a in ADJECTIVES for c in COLORS)
+        suffix += 1
+    names = rng.sample(names, count-1)
+    return names
+
+def format_contents(contents):
+    if not contents:
+        return "no other bags"
+    parts = [f"{num} {color} bag{'s' if num > 1 else ''}" for num, color in contents]
+    return ", ".join(parts)
+
+def generate(size, seed=None, depth=8, max_contents=4):
+    """size bag rules forming a DAG of the given depth.
+    shiny gold sits in the middle layer so it has both containers and contents.
+    """
+    rng = random.Random(seed)
+    size = max(size, depth)
+    names = color_names(size, rng)
+    layers = [[] for _ in range(depth)]
+    for i, name in enumerate(names):
+        layers[i % depth].append(name)
+    layers[depth//2].append(TARGET)
+    
+    rules = []
+    for level, layer in enumerate(layers):
+        lower = [c for l in layers[level+1:level+3] for c in l]
+        for color in layer:
+            contents = []
+            if lower and (color == TARGET or rng.random() < 0.8):
+                count = rng.randint(1, min(max_contents, len(lower)))
+                contents = [(rng.randint(1, 5), c) for c in rng.sample(lower, count)]
+            rules.append(f"{color} bags contain {format_contents(contents)}.\n")
+    rng.shuffle(rules)
+    return "".join(rules)
@@ -1,4 +1,6 @@
+import array
 import collections
+import itertools
 import time
 
 def remove_bag(color_bag):
@@ -15,17 +17,21 @@ def get_num_color(num_color_bag):
     num = int(num)
     return (num, color)
 
+def parse_rule(line):
+    line = line.strip().strip(".")
+    container, contents = line.split(" contain ")
+    container = remove_bag(container)
+    if contents == "no other bags":
+        contents = []
+    else:
+        contents = [get_num_color(c) for c in contents.split(",")]
+    return container, contents
+
 # rule_graph = {color: [(num, color), ...], ...}
 def construct_graph(rules):
     rule_graph = {}
     for line in rules:
-        line = line.strip().strip(".")
-        container, contents = line.split(" contain ")
-        container = remove_bag(container)
-        if contents == "no other bags":
-            contents = []
-        else:
-            contents = [get_num_color(c) for c in contents.split(",")]
+        container, contents = parse_rule(line)
         rule_graph[container] = contents
     return rule_graph
 
@@ -67,18 +73,216 @@ def find_num_contained(rule_graph, wanted_color, memo=None):
     
     return count
 
+class BagGraph:
+    """rule_graph compiled once: colors interned to ids 0..n-1 and the
+    contents (forward) and containers (reverse) of every color stored as
+    CSR arrays. The contents of id i are targets[offsets[i]:offsets[i+1]]
+    with counts nums[...], its containers are sources[rev_offsets[i]:rev_offsets[i+1]].
+    Queries are iterative, so deep rule chains can't hit the recursion limit.
+    """
+    def __init__(self, rule_graph):
+        self.colors = list(rule_graph)
+        self.ids = {color: i for i, color in enumerate(self.colors)}
+        for contents in rule_graph.values():
+            for num, color in contents:
+                if color not in self.ids:
+                    self.ids[color] = len(self.colors)
+                    self.colors.append(color)
+        n = len(self.colors)
+        
+        self.offsets = array.array("q", [0])
+        self.targets = array.array("q")
+        self.nums = array.array("q")
+        in_degree = [0] * n
+        for color in self.colors:
+            for num, content_color in rule_graph.get(color, ()):
+                target = self.ids[content_color]
+                self.targets.append(target)
+                self.nums.append(num)
+                in_degree[target] += 1
+            self.offsets.append(len(self.targets))
+        
+        self.rev_offsets = array.array("q", itertools.accumulate(in_degree, initial=0))
+        self.sources = array.array("q", bytes(8 * len(self.targets)))
+        fill = self.rev_offsets[:-1]
+        for source in range(n):
+            for target in self.targets[self.offsets[source]:self.offsets[source+1]]:
+                self.sources[fill[target]] = source
+                fill[target] += 1
+        
+        self.order = self.topological_order()
+        self.contained = [None] * n # memo of num_contained by id
+    
+    def __len__(self):
+        return len(self.colors)
+    
+    def contents(self, i):
+        start, end = self.offsets[i], self.offsets[i+1]
+        return zip(self.nums[start:end], self.targets[start:end])
+    
+    def containers_of(self, i):
+        return self.sources[self.rev_offsets[i]:self.rev_offsets[i+1]]
+    
+    def topological_order(self):
+        """Ids with every color after all the colors it contains."""
+        remaining = [self.offsets[i+1] - self.offsets[i] for i in range(len(self))]
+        order = [i for i in range(len(self)) if remaining[i] == 0]
+        for i in order: # order grows while iterating
+            for container in self.containers_of(i):
+                remaining[container] -= 1
+                if remaining[container] == 0:
+                    order.append(container)
+        if len(order) != len(self):
+            raise ValueError("bag rules contain a cycle")
+        return order
+    
+    def possible_origins(self, wanted_color):
+        """Colors that can eventually contain wanted_color."""
+        start = self.ids.get(wanted_color)
+        if start is None:
+            return set() # in no rule, so nothing contains it
+        seen = bytearray(len(self))
+        stack = [start]
+        origins = set()
+        while stack:
+            for container in self.containers_of(stack.pop()):
+                if not seen[container]:
+                    seen[container] = 1
+                    origins.add(self.colors[container])
+                    stack.append(container)
+        return origins
+    
+    def num_contained(self, wanted_color):
+        """Total number of bags inside one wanted_color bag. Results are
+        memoized across calls.
+        """
+        contained = self.contained
+        start = self.ids[wanted_color]
+        stack = [start]
+        while stack:
+            i = stack[-1]
+            if contained[i] is not None:
+                stack.pop()
+                continue
+            pending = [target for num, target in self.contents(i) if contained[target] is None]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            contained[i] = sum(num * (1 + contained[target]) for num, target in self.contents(i))
+        return contained[start]
+    
+    def all_num_contained(self):
+        """num_contained of every color, as a list indexed by id,
+        in one pass over the topological order.
+        """
+        contained = self.contained
+        for i in self.order:
+            if contained[i] is None:
+                contained[i] = sum(num * (1 + contained[target]) for num, target in self.contents(i))
+        return list(contained)
+    
+    def all_origin_counts(self):
+        """len(possible_origins) of every color, as an array indexed by id.
+        Sets of ancestors are int bitsets, pushed from containers down to their contents.
+        """
+        ancestors = [0] * len(self)
+        for i in reversed(self.order):
+            mask = ancestors[i] | (1 << i)
+            for target in self.targets[self.offsets[i]:self.offsets[i+1]]:
+                ancestors[target] |= mask
+        return array.array("q", (mask.bit_count() for mask in ancestors))
+
+class RuleGraph:
+    """Bag rules that can be edited after they are built. Reverse edges are
+    updated in place, and num_contained is memoized across calls: an edit
+    only forgets the memo of the edited color and the colors containing it.
+    """
+    def __init__(self, rule_graph=None):
+        self.rules = {}
+        self.reverse = collections.defaultdict(set) # {color: containers}
+        self.contained = {} # memo of num_contained
+        for color, contents in (rule_graph or {}).items():
+            self.set_rule(color, contents)
+    
+    def set_rule(self, color, contents):
+        """Adds the rule for color, or replaces it."""
+        self.unlink(color)
+        self.rules[color] = list(contents)
+        for num, content_color in self.rules[color]:
+            self.reverse[content_color].add(color)
+        self.invalidate(color)
+    
+    def remove_rule(self, color):
+        self.unlink(color)
+        del self.rules[color]
+        self.invalidate(color)
+    
+    def update(self, lines):
+        """Adds or replaces the rules of some rule lines."""
+        for line in lines:
+            self.set_rule(*parse_rule(line))
+    
+    def unlink(self, color):
+        for num, content_color in self.rules.get(color, ()):
+            containers = self.reverse[content_color]
+            containers.discard(color)
+            if not containers:
+                del self.reverse[content_color]
+    
+    def invalidate(self, color):
+        # a memoized color has all its contents memoized, so an ancestor
+        # that is not memoized has no memoized ancestors either
+        stack = [color]
+        while stack:
+            current = stack.pop()
+            if self.contained.pop(current, None) is not None or current == color:
+                stack.extend(self.reverse.get(current, ()))
+    
+    def possible_origins(self, wanted_color):
+        queue = collections.deque([wanted_color])
+        possible_origins = set()
+        while queue:
+            for container in self.reverse.get(queue.popleft(), ()):
+                if container not in possible_origins:
+                    possible_origins.add(container)
+                    queue.append(container)
+        return possible_origins
+    
+    def num_contained(self, wanted_color):
+        contained = self.contained
+        expanding = set()
+        stack = [wanted_color]
+        while stack:
+            color = stack[-1]
+            if color in contained:
+                stack.pop()
+                continue
+            contents = self.rules[color]
+            pending = [c for num, c in contents if c not in contained]
+            if pending:
+                if expanding.intersection(pending):
+                    raise ValueError(f"bag rules contain a cycle through {color}")
+                expanding.add(color)
+                stack.extend(pending)
+                continue
+            stack.pop()
+            expanding.discard(color)
+            contained[color] = sum(num * (1 + contained[c]) for num, c in contents)
+        return contained[wanted_color]
+
 if __name__ == "__main__":
     start = time.time()
     
     with open("input.txt") as f:
         rules = f.readlines()
     
-    rule_graph = construct_graph(rules)
+    bag_graph = BagGraph(construct_graph(rules))
     
-    origins = find_possible_origins(rule_graph, "shiny gold")
+    origins = bag_graph.possible_origins("shiny gold")
     print(f"part1: possible containers: {len(origins)}")
     
-    num_contained = find_num_contained(rule_graph, "shiny gold")
+    num_contained = bag_graph.num_contained("shiny gold")
     print(f"part2: Number of bags contained: {num_contained}")
     
     end = time.time()
@@ -0,0 +1,38 @@
+import random
+
+def random_filler(rng):
+    # acc/nop that can never leave the region they are in, even if flipped to jmp
+    if rng.random() < 0.5:
+        return f"acc {rng.randint(-50, 50):+d}"
+    return f"nop {-rng.randint(0, 10):+d}"
+
+def path_segment(rng, position, end):
+    """Instructions executed in order from position.
+    nops only ever point backwards, so flipping one to jmp gives a loop.
+    jmps skip over filler, so flipping one to nop rejoins the path.
+    """
+    choice = rng.random()
+    if choice < 0.5:
+        return [f"acc {rng.randint(-50, 50):+d}"]
+    if choice < 0.75 or end - position < 3:
+        return [f"nop {-rng.randint(0, position):+d}"]
+    skip = rng.randint(1, min(8, end - position - 2))
+    return [f"jmp {skip+1:+d}"] + [random_filler(rng) for _ in range(skip)]
+
+def build_path(rng, start, end):
+    instructions = []
+    while start + len(instructions) < end:
+        instructions.extend(path_segment(rng, start + len(instructions), end))
+    return instructions
+
+def generate(size, seed=None):
+    """size instructions that loop forever, and terminate once the single
+    corrupted jmp (around the middle of the program) is changed to nop.
+    """
+    rng = random.Random(seed)
+    size = max(size, 4)
+    corrupt_index = rng.randint(1, size//2)
+    prefix = build_path(rng, 0, corrupt_index)
+    corrupt = f"jmp {-rng.randint(1, len(prefix)):+d}"
+    suffix = build_path(rng, len(prefix)+1, size)
+    return "".join(f"{inst}\n" for inst in prefix + [corrupt] + suffix)
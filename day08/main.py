@@ -1,14 +1,135 @@
+import array
 import time
 
+OPCODES = ("nop", "acc", "jmp")
+NOP, ACC, JMP = range(len(OPCODES))
+
+class Program:
+    """Compiled assembly: opcodes and offsets in arrays, and the basic blocks
+    (runs of instructions only entered at the top and left at the bottom).
+    For the first instruction s of a block, block_acc[s] is what the block
+    adds to the accumulator and block_next[s] where it goes next.
+    Indexing and iterating still give (opcode, offset) tuples.
+    """
+    def __init__(self, instructions):
+        self.opcodes = array.array("b", (OPCODES.index(opcode) for opcode, offset in instructions))
+        self.offsets = array.array("q", (offset for opcode, offset in instructions))
+        n = len(self.opcodes)
+        
+        leaders = bytearray(n + 1)
+        leaders[0] = 1
+        leaders[n] = 1 # closes the last block
+        for index, (opcode, offset) in enumerate(zip(self.opcodes, self.offsets)):
+            if opcode == JMP:
+                leaders[index+1] = 1
+                if 0 <= index + offset <= n:
+                    leaders[index+offset] = 1
+        
+        self.block_acc = array.array("q", bytes(8 * n))
+        self.block_next = array.array("q", bytes(8 * n))
+        self.block_start = array.array("q", bytes(8 * n))
+        start = 0
+        accumulator = 0
+        for index in range(n):
+            self.block_start[index] = start
+            opcode, offset = self.opcodes[index], self.offsets[index]
+            if opcode == ACC:
+                accumulator += offset
+            if opcode == JMP or leaders[index+1]:
+                self.block_acc[start] = accumulator
+                self.block_next[start] = index + offset if opcode == JMP else index + 1
+                start = index + 1
+                accumulator = 0
+    
+    def __len__(self):
+        return len(self.opcodes)
+    
+    def __getitem__(self, index):
+        return OPCODES[self.opcodes[index]], self.offsets[index]
+    
+    def __iter__(self):
+        return zip(map(OPCODES.__getitem__, self.opcodes), self.offsets)
+    
+    def run_variants(self, patches):
+        """run() of the program with each patch ({index: (opcode, offset)})
+        applied, as a list of results. Variants share the program's arrays
+        and only step instruction by instruction through the blocks a patch
+        touches (or jumps into), so each costs about what it executes.
+        """
+        end = len(self)
+        opcodes, offsets = self.opcodes, self.offsets
+        block_acc, block_next, block_start = self.block_acc, self.block_next, self.block_start
+        # visited[i] == stamp when instruction i was executed by the current variant
+        visited = array.array("q", bytes(8 * end))
+        results = []
+        for stamp, patch in enumerate(patches, 1):
+            patch = {index: (OPCODES.index(opcode), offset) for index, (opcode, offset) in patch.items()}
+            dirty = set()
+            for index, (opcode, offset) in patch.items():
+                if not 0 <= index < end:
+                    raise IndexError(f"patch index {index} out of range")
+                dirty.add(block_start[index])
+                if opcode == JMP and 0 <= index + offset < end:
+                    dirty.add(block_start[index+offset])
+            
+            instruction_pointer = 0
+            accumulator = 0
+            while True:
+                if instruction_pointer == end:
+                    results.append((instruction_pointer, accumulator, "Normal"))
+                    break
+                elif instruction_pointer < 0 or end < instruction_pointer:
+                    results.append((instruction_pointer, accumulator, "OutOfBounds"))
+                    break
+                elif visited[instruction_pointer] == stamp:
+                    results.append((instruction_pointer, accumulator, "InfiniteLoop"))
+                    break
+                visited[instruction_pointer] = stamp
+                if block_start[instruction_pointer] in dirty:
+                    if instruction_pointer in patch:
+                        opcode, offset = patch[instruction_pointer]
+                    else:
+                        opcode, offset = opcodes[instruction_pointer], offsets[instruction_pointer]
+                    if opcode == ACC:
+                        accumulator += offset
+                    instruction_pointer += offset if opcode == JMP else 1
+                else:
+                    # clean blocks are only ever entered at their first instruction
+                    accumulator += block_acc[instruction_pointer]
+                    instruction_pointer = block_next[instruction_pointer]
+        return results
+    
+    def run(self):
+        """Same result as check_termination, one block at a time."""
+        end = len(self)
+        block_acc = self.block_acc
+        block_next = self.block_next
+        visited = bytearray(end)
+        instruction_pointer = 0
+        accumulator = 0
+        while True:
+            if instruction_pointer == end:
+                return instruction_pointer, accumulator, "Normal"
+            elif instruction_pointer < 0 or end < instruction_pointer:
+                return instruction_pointer, accumulator, "OutOfBounds"
+            elif visited[instruction_pointer]:
+                return instruction_pointer, accumulator, "InfiniteLoop"
+            visited[instruction_pointer] = 1
+            accumulator += block_acc[instruction_pointer]
+            instruction_pointer = block_next[instruction_pointer]
+
 def preprocess_assembly(assembly):
     instructions = []
     for line in assembly:
         opcode, offset = line.strip().split()
         offset = int(offset)
         instructions.append((opcode, offset))
-    return instructions
+    return Program(instructions)
 
 def check_termination(assembly):
+    if isinstance(assembly, Program):
+        return assembly.run()
+    
     instruction_pointer = 0
     accumulator = 0
     seen_instructions = set()
@@ -33,22 +154,79 @@ def check_termination(assembly):
     
     return instruction_pointer, accumulator, "Error"
 
+def next_instruction(index, opcode, offset):
+    return index + offset if opcode == "jmp" else index + 1
+
 def find_corrupt_instruction(assembly):
+    """The lowest index whose nop/jmp swap makes the program terminate normally,
+    as (instruction_pointer, accumulator, index), or (0, 0, -1). O(n): a swap
+    only matters on the executed path, and it fixes the program if it jumps
+    to an instruction that reaches the end without coming back to the part
+    of the path already executed.
+    """
     switch_opcode = {"nop":"jmp", "jmp":"nop"}
+    assembly = list(assembly) # tuples are quicker to index than a Program
+    end = len(assembly)
     
-    for index, instruction in enumerate(assembly):
-        if instruction[0] == "acc":
+    # the unchanged run, with the position in it of every instruction executed
+    run_position = [None] * (end + 1)
+    run = []
+    run_accumulators = []
+    instruction_pointer = 0
+    accumulator = 0
+    while 0 <= instruction_pointer <= end and run_position[instruction_pointer] is None:
+        run_position[instruction_pointer] = len(run)
+        if instruction_pointer == end:
+            break
+        run.append(instruction_pointer)
+        run_accumulators.append(accumulator)
+        opcode, offset = assembly[instruction_pointer]
+        if opcode == "acc":
+            accumulator += offset
+        instruction_pointer = next_instruction(instruction_pointer, opcode, offset)
+    terminates = instruction_pointer == end
+    
+    # walk back from the end: accumulator gained on the way to it, and the
+    # first position of the unchanged run met on the way (or infinity)
+    predecessors = [[] for _ in range(end + 1)]
+    for index, (opcode, offset) in enumerate(assembly):
+        target = next_instruction(index, opcode, offset)
+        if 0 <= target <= end:
+            predecessors[target].append(index)
+    to_end = [None] * (end + 1)
+    merge_position = [None] * (end + 1)
+    to_end[end] = 0
+    merge_position[end] = run_position[end] if terminates else float("inf")
+    stack = [end]
+    while stack:
+        target = stack.pop()
+        for index in predecessors[target]:
+            opcode, offset = assembly[index]
+            to_end[index] = to_end[target] + (offset if opcode == "acc" else 0)
+            if run_position[index] is not None:
+                merge_position[index] = run_position[index]
+            else:
+                merge_position[index] = merge_position[target]
+            stack.append(index)
+    
+    fixes = []
+    for position, index in enumerate(run):
+        opcode, offset = assembly[index]
+        if opcode == "acc":
             continue
-        
-        trial_assembly = assembly.copy()
-        new_opcode = switch_opcode[instruction[0]]
-        trial_assembly[index] = (new_opcode, instruction[1])
-        
-        instruction_pointer, accumulator, termination_type = check_termination(trial_assembly)
-        if termination_type == "Normal":
-            return instruction_pointer, accumulator, index
+        target = next_instruction(index, switch_opcode[opcode], offset)
+        if 0 <= target <= end and to_end[target] is not None and merge_position[target] > position:
+            fixes.append((end, run_accumulators[position] + to_end[target], index))
+    if terminates:
+        # swapping an instruction that is never executed changes nothing
+        for index, (opcode, offset) in enumerate(assembly):
+            if opcode != "acc" and run_position[index] is None:
+                fixes.append((end, accumulator, index))
+                break
     
-    return 0, 0, -1
+    if not fixes:
+        return 0, 0, -1
+    return min(fixes, key=lambda fix: fix[2])
 
 if __name__ == "__main__":
     start = time.time()
@@ -0,0 +1,39 @@
+import random
+
+PREAMBLE_SIZE = 25
+
+def pair_sums(window):
+    return {a+b for a in window for b in window if a != b}
+
+def generate(size, seed=None):
+    """size numbers where each number is the sum of two different numbers
+    among the previous 25, except one that is instead the sum of a
+    contiguous run of earlier numbers.
+    Values roughly double every 25 numbers, so large sizes give large ints.
+    """
+    rng = random.Random(seed)
+    size = max(size, PREAMBLE_SIZE+2)
+    data = rng.sample(range(1, 2*PREAMBLE_SIZE+1), PREAMBLE_SIZE)
+    invalid_index = rng.randint(PREAMBLE_SIZE + (size-PREAMBLE_SIZE)//2, size-1)
+    
+    while len(data) < size:
+        window = data[-PREAMBLE_SIZE:]
+        if len(data) == invalid_index:
+            valid_sums = pair_sums(window)
+            while True:
+                start = rng.randint(0, len(data)//2)
+                length = rng.randint(2, 17)
+                run_sum = sum(data[start:start+length])
+                if run_sum not in valid_sums and run_sum not in window:
+                    break
+            data.append(run_sum)
+            continue
+        
+        # keep growth low by preferring the smaller numbers of the window
+        ordered = sorted(window)
+        for smallest in (8, PREAMBLE_SIZE):
+            candidates = [s for s in pair_sums(ordered[:smallest]) if s not in window]
+            if candidates:
+                break
+        data.append(rng.choice(candidates))
+    return "".join(f"{x}\n" for x in data)
@@ -3,23 +3,52 @@ import time
 
 Estimate = collections.namedtuple("Estimate", ["start","end","sum"])
 
-def val_vaild_given_preamble(val, preamble):
-    for possible_part in preamble:
-        if val - possible_part in preamble:
-            return True
-    return False
-
-def find_invalid(data):
-    PREAMBLE_SIZE = 25
-    preamble = set(data[0:PREAMBLE_SIZE])
-    current_index = PREAMBLE_SIZE
+class SlidingWindow:
+    """The last size values, with multiplicity counts so duplicates are fine.
+    is_pair_sum looks up value - x for the distinct values x in the window,
+    stopping at the first match, all inside C (keys().isdisjoint over a map),
+    so repeated values cost nothing and valid values rarely scan the whole window.
+    """
+    def __init__(self, size):
+        self.size = size
+        self.values = collections.deque()
+        self.counts = collections.Counter()
+    
+    def __len__(self):
+        return len(self.values)
+    
+    def is_full(self):
+        return len(self.values) >= self.size
     
-    for i, val in enumerate(data[PREAMBLE_SIZE:], PREAMBLE_SIZE):
-        if not val_vaild_given_preamble(val, preamble):
-            return i, val
-        preamble.remove(data[i-PREAMBLE_SIZE])
-        preamble.add(val)
-    return None, None
+    def is_pair_sum(self, value):
+        """Whether two different values in the window add up to value."""
+        parts = self.counts.keys()
+        if value % 2 == 0:
+            # value/2 can only pair with itself, which doesn't count
+            parts = filter((value // 2).__ne__, parts)
+        return not self.counts.keys().isdisjoint(map(value.__sub__, parts))
+    
+    def push(self, value):
+        self.values.append(value)
+        self.counts[value] += 1
+        if len(self.values) > self.size:
+            old = self.values.popleft()
+            self.counts[old] -= 1
+            if self.counts[old] == 0:
+                del self.counts[old]
+
+def iter_invalid(numbers, preamble_size=25):
+    """(index, value) of every value in a stream of numbers that is not the
+    sum of two different values among the preamble_size before it.
+    """
+    window = SlidingWindow(preamble_size)
+    for i, val in enumerate(numbers):
+        if window.is_full() and not window.is_pair_sum(val):
+            yield i, val
+        window.push(val)
+
+def find_invalid(data, preamble_size=25):
+    return next(iter_invalid(data, preamble_size), (None, None))
 
 def advance_start(data, estimate):
     new_sum = estimate.sum - data[estimate.start]
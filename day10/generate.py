@@ -0,0 +1,12 @@
+import random
+
+def generate(size, seed=None):
+    """size adapters whose joltages differ by 1 or 3 once sorted."""
+    rng = random.Random(seed)
+    joltage = 0
+    adapters = []
+    for i in range(size):
+        joltage += rng.choice((1, 1, 1, 3))
+        adapters.append(joltage)
+    rng.shuffle(adapters)
+    return "".join(f"{x}\n" for x in adapters)
@@ -0,0 +1,67 @@
+import random
+
+DIRECTIONS = [(i, j) for i in (-1, 0, 1) for j in (-1, 0, 1) if (i, j) != (0, 0)]
+
+def compute_sights(grid, max_range):
+    rows = len(grid)
+    cols = len(grid[0])
+    sights = {}
+    for i in range(rows):
+        for j in range(cols):
+            if not grid[i][j]:
+                continue
+            sight = []
+            for di, dj in DIRECTIONS:
+                r, c = i, j
+                for step in range(max_range):
+                    r += di
+                    c += dj
+                    if not (0 <= r < rows and 0 <= c < cols):
+                        break
+                    if grid[r][c]:
+                        sight.append((r, c))
+                        break
+            sights[(i, j)] = sight
+    return sights
+
+def find_oscillating(grid, max_range, leave_threshold):
+    """Runs the seating rules until they settle.
+    Threshold rules like these either reach a fixed point or a 2-cycle, so
+    returns the seats that flip in the 2-cycle (empty if it is stable).
+    """
+    sights = compute_sights(grid, max_range)
+    occupied = {seat: False for seat in sights}
+    previous = None
+    while True:
+        new_occupied = {}
+        for seat, sight in sights.items():
+            count = sum(occupied[s] for s in sight)
+            if occupied[seat]:
+                new_occupied[seat] = count < leave_threshold
+            else:
+                new_occupied[seat] = count == 0
+        if new_occupied == occupied:
+            return set()
+        if new_occupied == previous:
+            return {seat for seat in sights if occupied[seat] != new_occupied[seat]}
+        previous = occupied
+        occupied = new_occupied
+
+def generate(size, seed=None, width=None, density=0.85):
+    """size rows of seats (square by default) that become stable under both
+    the part 1 and part 2 rules. Seats that would oscillate are turned to floor.
+    """
+    rng = random.Random(seed)
+    if width is None:
+        width = size
+    grid = [[rng.random() < density for _ in range(width)] for _ in range(size)]
+    
+    while True:
+        oscillating = find_oscillating(grid, 1, 4)
+        oscillating |= find_oscillating(grid, max(size, width), 5)
+        if not oscillating:
+            break
+        for i, j in oscillating:
+            grid[i][j] = False
+    
+    return "".join("".join("L" if s else "." for s in row) + "\n" for row in grid)
@@ -81,9 +81,11 @@ def add_coord(coord1, coord2):
     return Coord(coord1.row+coord2.row, coord1.col+coord2.col)
 
 class SeatSimulation:
-    def __init__(self, seats, max_range=1, leave_threshold=4):
+    def __init__(self, seats, max_range=1, leave_threshold=4, sights=None):
         self.seats = seats
-        self.sights = self.compute_all_sights(max_range)
+        if sights is None:
+            sights = self.compute_all_sights(max_range)
+        self.sights = sights
         self.leave_threshold = leave_threshold
     
     def in_boundary(self, coord):
@@ -0,0 +1,13 @@
+import random
+
+def generate(size, seed=None):
+    rng = random.Random(seed)
+    lines = []
+    for i in range(size):
+        action = rng.choice("NSEWLRFFF")
+        if action in "LR":
+            val = rng.choice((90, 180, 270))
+        else:
+            val = rng.randint(1, 100)
+        lines.append(f"{action}{val}\n")
+    return "".join(lines)
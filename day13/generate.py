@@ -0,0 +1,23 @@
+import random
+
+def primes_from(start, count):
+    primes = []
+    candidate = start
+    while len(primes) < count:
+        if all(candidate % d for d in range(2, int(candidate**0.5)+1)):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+def generate(size, seed=None, max_gap=10):
+    """size buses, each with a distinct prime id, separated by up to max_gap x's."""
+    rng = random.Random(seed)
+    buses = primes_from(13, size*2)
+    buses = rng.sample(buses, size)
+    schedule = []
+    for b in buses:
+        if schedule:
+            schedule.extend("x" for _ in range(rng.randint(0, max_gap)))
+        schedule.append(str(b))
+    timestamp = rng.randint(10**5, 10**7)
+    return f"{timestamp}\n{','.join(schedule)}\n"
@@ -0,0 +1,18 @@
+import random
+
+def random_mask(rng, floating):
+    mask = [rng.choice("01") for _ in range(36)]
+    for idx in rng.sample(range(36), floating):
+        mask[idx] = "X"
+    return "".join(mask)
+
+def generate(size, seed=None, max_floating=9, max_writes=6):
+    """size instructions. Part 2 writes up to 2**max_floating addresses per write."""
+    rng = random.Random(seed)
+    lines = []
+    while len(lines) < size:
+        floating = rng.randint(max(0, max_floating-5), max_floating)
+        lines.append(f"mask = {random_mask(rng, floating)}\n")
+        for i in range(rng.randint(1, max_writes)):
+            lines.append(f"mem[{rng.randint(0, 65535)}] = {rng.randint(0, 2**30)}\n")
+    return "".join(lines[:size])
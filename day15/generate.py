@@ -0,0 +1,10 @@
+import random
+
+def generate(size, seed=None):
+    """size distinct starting numbers.
+    The turn count of the game is fixed by the puzzle, not by the input.
+    """
+    rng = random.Random(seed)
+    size = max(size, 1)
+    numbers = rng.sample(range(max(2*size, 20)), size)
+    return ",".join(str(x) for x in numbers) + "\n"
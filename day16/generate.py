@@ -0,0 +1,60 @@
+import random
+import string
+
+BAND_WIDTH = 20
+
+def field_names(count, rng):
+    departures = ["departure location", "departure station", "departure platform",
+                  "departure track", "departure date", "departure time"]
+    names = set(departures[:count])
+    while len(names) < count:
+        word = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8)))
+        names.add(f"{word} {rng.choice(['class', 'row', 'seat', 'zone', 'price', 'type'])}")
+    return sorted(names, key=lambda n: (not n.startswith("departure"), n))
+
+def generate(size, seed=None, num_fields=20):
+    """size nearby tickets with num_fields fields. About a fifth of the tickets
+    have a value that is invalid for every field.
+    
+    Field k accepts the value bands of positions k..num_fields-1 (plus a shared
+    upper range), so the positions can be resolved one at a time by elimination.
+    """
+    rng = random.Random(seed)
+    names = field_names(num_fields, rng)
+    rng.shuffle(names)
+    
+    bands = [(1 + k*BAND_WIDTH, (k+1)*BAND_WIDTH) for k in range(num_fields)]
+    bands_end = bands[-1][1]
+    hole = (bands_end+1, bands_end+BAND_WIDTH)
+    shared = (hole[1]+1, hole[1]+5*BAND_WIDTH)
+    
+    field_lines = []
+    for k, name in enumerate(names):
+        field_lines.append(f"{name}: {bands[k][0]}-{bands_end} or {shared[0]}-{shared[1]}")
+    rng.shuffle(field_lines)
+    
+    # position_order[p] is the band (elimination order) of ticket position p
+    position_order = list(range(num_fields))
+    rng.shuffle(position_order)
+    
+    def valid_ticket(force_band=False):
+        ticket = []
+        for k in position_order:
+            if force_band or rng.random() < 0.7:
+                ticket.append(rng.randint(*bands[k]))
+            else:
+                ticket.append(rng.randint(*shared))
+        return ticket
+    
+    myticket = valid_ticket()
+    tickets = [valid_ticket(force_band=(i == 0)) for i in range(max(size, 1))]
+    for ticket in tickets[1:]:
+        if rng.random() < 0.2:
+            ticket[rng.randrange(num_fields)] = rng.choice([rng.randint(*hole), 0])
+    rng.shuffle(tickets)
+    
+    lines = field_lines
+    lines += ["", "your ticket:", ",".join(str(x) for x in myticket)]
+    lines += ["", "nearby tickets:"]
+    lines += [",".join(str(x) for x in ticket) for ticket in tickets]
+    return "\n".join(lines) + "\n"
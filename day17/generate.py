@@ -0,0 +1,9 @@
+import random
+
+def generate(size, seed=None, density=0.4):
+    """size x size initial slice."""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(size):
+        lines.append("".join("#" if rng.random() < density else "." for _ in range(size)) + "\n")
+    return "".join(lines)
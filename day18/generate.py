@@ -0,0 +1,18 @@
+import random
+
+def random_expression(rng, depth, max_terms=6):
+    terms = []
+    for i in range(rng.randint(2, max_terms)):
+        if depth > 0 and rng.random() < 0.25:
+            terms.append(f"({random_expression(rng, depth-1, max_terms)})")
+        else:
+            terms.append(str(rng.randint(1, 9)))
+    expression = terms[0]
+    for t in terms[1:]:
+        expression += f" {rng.choice('+*')} {t}"
+    return expression
+
+def generate(size, seed=None, max_depth=3):
+    """size expressions nested up to max_depth parentheses."""
+    rng = random.Random(seed)
+    return "".join(random_expression(rng, max_depth) + "\n" for _ in range(size))
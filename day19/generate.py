@@ -0,0 +1,70 @@
+import random
+
+FIXED_IDS = (0, 8, 11, 31, 42)
+
+def expand(rules, rule_id, rng):
+    case = rng.choice(rules[rule_id])
+    if isinstance(case, str):
+        return case
+    return "".join(expand(rules, elem, rng) for elem in case)
+
+def format_rule(rule_id, cases):
+    if isinstance(cases[0], str):
+        return f'{rule_id}: "{cases[0]}"'
+    return f"{rule_id}: " + " | ".join(" ".join(str(e) for e in case) for case in cases)
+
+def generate(size, seed=None, depth=8, messages=None):
+    """size grammar rules in the shape of the puzzle: 0: 8 11, 8: 42, 11: 42 31,
+    where 42 and 31 match words of length depth. There are 4*size messages by
+    default, a mix of part 1 matches, part 2 only matches and random words.
+    
+    Rules come in complementary pairs, e.g.
+        R: "a" X | "b" Y
+        R': "a" X' | "b" Y'
+    so every word of a given length matches exactly one rule of each pair,
+    with a single parse, like the puzzle input. 42 and 31 are such a pair.
+    """
+    rng = random.Random(seed)
+    size = max(size, len(FIXED_IDS) + 2 + 2*(depth-2))
+    if messages is None:
+        messages = 4*size
+    
+    free_ids = [i for i in range(max(2*size, 64)) if i not in FIXED_IDS]
+    free_ids = rng.sample(free_ids, size - len(FIXED_IDS))
+    a_id, b_id = free_ids[:2]
+    rules = {0: [(8, 11)], 8: [(42,)], 11: [(42, 31)], a_id: ["a"], b_id: ["b"]}
+    
+    # levels[d] holds the complementary pairs matching words of length d+1
+    levels = [[(a_id, b_id)]] + [[] for _ in range(depth-1)]
+    pair_ids = free_ids[2:]
+    for i in range(0, len(pair_ids) - 1, 2):
+        levels[1 + (i//2) % (depth-2)].append((pair_ids[i], pair_ids[i+1]))
+    levels[-1].append((42, 31))
+    
+    for d, level in enumerate(levels[1:], 1):
+        for rule_id, complement_id in level:
+            x, x_complement = rng.choice(levels[d-1])
+            y, y_complement = rng.choice(levels[d-1])
+            if rng.random() < 0.5:
+                x, x_complement = x_complement, x
+            if rng.random() < 0.5:
+                rules[rule_id] = [(a_id, x), (b_id, y)]
+                rules[complement_id] = [(a_id, x_complement), (b_id, y_complement)]
+            else:
+                rules[rule_id] = [(x, a_id), (y, b_id)]
+                rules[complement_id] = [(x_complement, a_id), (y_complement, b_id)]
+    
+    lines = [format_rule(rule_id, cases) for rule_id, cases in rules.items()]
+    rng.shuffle(lines)
+    lines.append("")
+    for i in range(messages):
+        kind = rng.random()
+        if kind < 0.3:
+            words = [42, 42, 31]
+        elif kind < 0.6:
+            count31 = rng.randint(1, 3)
+            words = [42] * (count31 + rng.randint(1, 3)) + [31] * count31
+        else:
+            words = [rng.choice((42, 31)) for _ in range(rng.randint(2, 6))]
+        lines.append("".join(expand(rules, w, rng) for w in words))
+    return "\n".join(lines) + "\n"
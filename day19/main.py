@@ -105,7 +105,7 @@ def matchrule(message, start_index, ruleid, allrules):
             yield i
 
 def match_exact(message, ruleid, allrules):
-    return len(message) in matchrule(message, 0, ruleid, rules)
+    return len(message) in matchrule(message, 0, ruleid, allrules)
 
 def is_optimization_candidate(rule):
     return rule.fully_known and len(rule.cases) <= 4
@@ -0,0 +1,83 @@
+import math
+import random
+
+MONSTER = [
+    "                  # ",
+    "#    ##    ##    ###",
+    " #  #  #  #  #  #   ",
+]
+
+def orient(grid, rotation, flipped):
+    if flipped:
+        grid = [row[::-1] for row in grid]
+    for i in range(rotation):
+        grid = ["".join(x) for x in zip(*reversed(grid))]
+    return grid
+
+def random_edge(rng, first, last, length, used):
+    """A side with the given corner pixels that doesn't match any used side
+    in either direction, so that every tile fits in exactly one place.
+    """
+    while True:
+        edge = first + "".join(rng.choice("#.") for _ in range(length-2)) + last
+        canonical = min(edge, edge[::-1])
+        if edge != edge[::-1] and canonical not in used:
+            used.add(canonical)
+            return edge
+
+def plant_monsters(image, rng):
+    height = len(MONSTER)
+    length = len(MONSTER[0])
+    taken = set()
+    for attempt in range(len(image)**2 // 200):
+        i = rng.randrange(len(image) - height + 1)
+        j = rng.randrange(len(image) - length + 1)
+        box = {(i+di, j+dj) for di in range(height) for dj in range(-length+1, length)}
+        if box & taken:
+            continue
+        taken |= box
+        for di, line in enumerate(MONSTER):
+            for dj, char in enumerate(line):
+                if char == "#":
+                    image[i+di][j+dj] = "#"
+
+def generate(size, seed=None, tile_size=None, density=0.3):
+    """A square jigsaw of n*n tiles, where n = isqrt(size).
+    Tiles are 10x10 unless there are too many sides to keep them all unique,
+    in which case tile_size grows.
+    """
+    rng = random.Random(seed)
+    n = max(math.isqrt(size), 2)
+    num_edges = 2*n*(n+1)
+    if tile_size is None:
+        tile_size = 10
+        while 2**(tile_size-1) < 4*num_edges:
+            tile_size += 1
+    inner = tile_size - 2
+    
+    image = [["#" if rng.random() < density else "." for _ in range(n*inner)]
+             for _ in range(n*inner)]
+    plant_monsters(image, rng)
+    
+    corners = [[rng.choice("#.") for _ in range(n+1)] for _ in range(n+1)]
+    used = set()
+    horizontal = [[random_edge(rng, corners[r][c], corners[r][c+1], tile_size, used)
+                   for c in range(n)] for r in range(n+1)]
+    vertical = [[random_edge(rng, corners[r][c], corners[r+1][c], tile_size, used)
+                 for c in range(n+1)] for r in range(n)]
+    
+    ids = rng.sample(range(1000, 1000 + max(9000, 2*n*n)), n*n)
+    tiles = []
+    for r in range(n):
+        for c in range(n):
+            grid = [horizontal[r][c]]
+            for k in range(inner):
+                interior = "".join(image[r*inner + k][c*inner:(c+1)*inner])
+                grid.append(vertical[r][c][k+1] + interior + vertical[r][c+1][k+1])
+            grid.append(horizontal[r+1][c])
+            grid = orient(grid, rng.randrange(4), rng.random() < 0.5)
+            tiles.append(grid)
+    rng.shuffle(tiles)
+    
+    blocks = [f"Tile {tile_id}:\n" + "\n".join(grid) for tile_id, grid in zip(ids, tiles)]
+    return "\n\n".join(blocks) + "\n"
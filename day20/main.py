@@ -3,7 +3,7 @@ import enum
 import collections
 
 Coord = collections.namedtuple("Coord", ["x","y"])
-Side = collections.namedtuple("Sides", ["up","right","down","left"])
+Side = collections.namedtuple("Side", ["up","right","down","left"])
 
 class Direction(enum.IntEnum):
     UP = 0
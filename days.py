@@ -0,0 +1,234 @@
+import collections
+import importlib.util
+import os
+import sys
+
+import cache
+import loader
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+ALL_DAYS = tuple(range(1, 21))
+PHASES = ("parse", "part1", "part2")
+
+# Each phase is a function of (module, input) -> value.
+# parse takes the input path, part1/part2 take the value returned by parse.
+# part1/part2 must not depend on each other, so they can be timed separately.
+DaySpec = collections.namedtuple("DaySpec", PHASES)
+
+def day_dir(day):
+    return os.path.join(ROOT, f"day{day:02}")
+
+def input_path(day):
+    path = os.path.join(day_dir(day), "input.txt")
+    if not os.path.exists(path):
+        return None
+    return path
+
+def load_day(day, filename="main"):
+    name = f"day{day:02}" if filename == "main" else f"day{day:02}_{filename}"
+    if name in sys.modules:
+        return sys.modules[name]
+    path = os.path.join(day_dir(day), f"{filename}.py")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def read_lines(path):
+    with loader.Input(path) as data:
+        return str(data.read(), "utf-8").splitlines(keepends=True)
+
+def read_bytes(path):
+    with loader.Input(path) as data:
+        return data.read()
+
+def read_text(path):
+    with loader.Input(path) as data:
+        return str(data.read(), "utf-8").strip()
+
+def product(values):
+    result = 1
+    for x in values:
+        result *= x
+    return result
+
+def day03_part2(m, map):
+    slopes = [m.Coord(1,1), m.Coord(1,3), m.Coord(1,5), m.Coord(1,7), m.Coord(2,1)]
+    return product(m.count_trees_many(map, slopes))
+
+def day05_part2(m, all_seats):
+    missing = m.find_gaps(all_seats)
+    return missing[0] if len(missing) == 1 else missing
+
+def day09_part2(m, data):
+    index, invalid_num = m.find_invalid(data)
+    estimate = m.find_contiguous_sum(data, invalid_num)
+    return m.add_smallest_and_largest(data, estimate)
+
+def day11_part(m, seats, max_range, leave_threshold):
+    sights = cache.cached(f"sights-{max_range}",
+                          lambda: m.SeatSimulation(seats, max_range=max_range).sights)
+    seat_sim = m.SeatSimulation(seats, max_range=max_range, leave_threshold=leave_threshold,
+                                sights=sights)
+    seat_sim.iterate_till_stable()
+    return seat_sim.get_num_occupied()
+
+def day12_part(m, instructions, initial, next_position_func):
+    final_pos = m.execute_instructions(initial, instructions, next_position_func)
+    return abs(final_pos[0])+abs(final_pos[1])
+
+def day15_parse(m, path):
+    if path is None:
+        return [7,12,1,0,16,2]
+    return [int(x) for x in read_text(path).split(",")]
+
+def day16_part2(m, parsed):
+    fields, myticket, nearby_tickets = parsed
+    known_fields = m.identify_field_positions(fields, myticket, nearby_tickets)
+    return m.get_departure_product(known_fields, myticket)
+
+def day17_part(m, data, dims):
+    active_cubes = m.preprocess_state(data)
+    for i in range(6):
+        active_cubes = m.next_state(active_cubes, dims)
+    return len(active_cubes)
+
+def day19_optimized_rules(m, data, replacements):
+    rules, messages = m.process_data(data)
+    for line in replacements:
+        rule = m.Rule(line)
+        rules[rule.id] = rule
+    m.optimize_rules(rules)
+    return rules
+
+def day19_part(m, data, name, replacements=()):
+    rules = cache.cached(f"rules-{name}", lambda: day19_optimized_rules(m, data, replacements))
+    messages = data[data.index("")+1:]
+    return sum(m.match_exact(msg, 0, rules) for msg in messages)
+
+SPECS = {
+    1: DaySpec(
+        parse=lambda m, path: [int(line.strip()) for line in read_lines(path)],
+        part1=lambda m, expense: product(m.get_2020_pair(expense)),
+        part2=lambda m, expense: product(m.get_2020_triplet(expense)),
+    ),
+    2: DaySpec(
+        parse=lambda m, path: m.PasswordColumns(read_bytes(path)),
+        part1=lambda m, passwords: passwords.count_valid1(),
+        part2=lambda m, passwords: passwords.count_valid2(),
+    ),
+    3: DaySpec(
+        parse=lambda m, path: [line.strip() for line in read_lines(path)],
+        part1=lambda m, map: m.count_trees(map, m.Coord(1,3)),
+        part2=day03_part2,
+    ),
+    4: DaySpec(
+        parse=lambda m, path: m.extract_passports(read_text(path)),
+        part1=lambda m, passports: sum(m.is_all_fields_present(p) for p in passports),
+        part2=lambda m, passports: sum(m.validate_many(passports)),
+    ),
+    5: DaySpec(
+        parse=lambda m, path: m.seat_ids(read_bytes(path)),
+        part1=lambda m, all_seats: max(all_seats),
+        part2=day05_part2,
+    ),
+    6: DaySpec(
+        parse=lambda m, path: [list(map(m.person_mask, g)) for g in m.extract_groups(read_text(path))],
+        part1=lambda m, groups: sum(m.count_any(masks) for masks in groups),
+        part2=lambda m, groups: sum(m.count_all(masks) for masks in groups),
+    ),
+    7: DaySpec(
+        parse=lambda m, path: cache.cached("graph", lambda: m.BagGraph(m.construct_graph(read_lines(path)))),
+        part1=lambda m, bag_graph: len(bag_graph.possible_origins("shiny gold")),
+        part2=lambda m, bag_graph: bag_graph.num_contained("shiny gold"),
+    ),
+    8: DaySpec(
+        parse=lambda m, path: m.preprocess_assembly(read_lines(path)),
+        part1=lambda m, assembly: m.check_termination(assembly)[1],
+        part2=lambda m, assembly: m.find_corrupt_instruction(assembly)[1],
+    ),
+    9: DaySpec(
+        parse=lambda m, path: [int(x) for x in read_lines(path)],
+        part1=lambda m, data: m.find_invalid(data)[1],
+        part2=day09_part2,
+    ),
+    10: DaySpec(
+        parse=lambda m, path: [int(x.strip()) for x in read_lines(path)],
+        part1=lambda m, adapters: m.get_difference_product(adapters),
+        part2=lambda m, adapters: m.get_possibilities(adapters),
+    ),
+    11: DaySpec(
+        parse=lambda m, path: m.preprocess_seats(read_lines(path)),
+        part1=lambda m, seats: day11_part(m, seats, 1, 4),
+        part2=lambda m, seats: day11_part(m, seats, max(len(seats), len(seats[0])), 5),
+    ),
+    12: DaySpec(
+        parse=lambda m, path: m.preprocess_instructions(read_lines(path)),
+        part1=lambda m, instructions: day12_part(
+            m, instructions, m.Position(0,0,"E"), m.next_position_part1),
+        part2=lambda m, instructions: day12_part(
+            m, instructions, m.Position(0,0,m.Position(1,10,None)), m.next_position_part2),
+    ),
+    13: DaySpec(
+        parse=lambda m, path: [x.strip() for x in read_lines(path)],
+        part1=lambda m, data: m.part1(data),
+        part2=lambda m, data: m.earliest_sequence_departure_time(m.preprocess_part2(data)),
+    ),
+    14: DaySpec(
+        parse=lambda m, path: m.process_data([line.strip() for line in read_lines(path)]),
+        part1=lambda m, instructions: m.compute_memory_sum_part1(instructions),
+        part2=lambda m, instructions: m.compute_memory_sum_part2(instructions),
+    ),
+    15: DaySpec(
+        parse=day15_parse,
+        part1=lambda m, data: m.get_num(data, 2020),
+        part2=lambda m, data: m.get_num(data, 30000000),
+    ),
+    16: DaySpec(
+        parse=lambda m, path: m.process_data(read_lines(path)),
+        part1=lambda m, parsed: m.scanning_error_rate(parsed[0], parsed[2]),
+        part2=day16_part2,
+    ),
+    17: DaySpec(
+        parse=lambda m, path: read_lines(path),
+        part1=lambda m, data: day17_part(m, data, 3),
+        part2=lambda m, data: day17_part(m, data, 4),
+    ),
+    18: DaySpec(
+        parse=lambda m, path: [m.parse_line(line) for line in read_lines(path)],
+        part1=lambda m, expressions: sum(m.shunting_yard_evaluate(e, {"+":0,"*":0})
+                                         for e in expressions),
+        part2=lambda m, expressions: sum(m.shunting_yard_evaluate(e, {"+":1,"*":0})
+                                         for e in expressions),
+    ),
+    19: DaySpec(
+        parse=lambda m, path: [line.strip() for line in read_lines(path)],
+        part1=lambda m, data: day19_part(m, data, "part1"),
+        part2=lambda m, data: day19_part(m, data, "part2",
+                                         ["8: 42 | 42 8", "11: 42 31 | 42 11 31"]),
+    ),
+    20: DaySpec(
+        parse=lambda m, path: [m.Tile(t) for t in read_text(path).split("\n\n")],
+        part1=lambda m, tiles: m.compute_part1(cache.cached("map", lambda: m.fit_all_tiles(tiles))),
+        part2=lambda m, tiles: m.compute_part2(cache.cached("map", lambda: m.fit_all_tiles(tiles))),
+    ),
+}
+
+def run_phase(day, phase, path=None, parsed=None, disk_cache=None):
+    """Runs a single phase of a day and returns its value.
+    parse reads from path (the day's input.txt by default).
+    part1/part2 use parsed if given, otherwise they parse first.
+    With a cache.DiskCache, intermediates are reused from previous runs on
+    the same input (parsed must then come from that input).
+    """
+    module = load_day(day)
+    spec = SPECS[day]
+    if path is None:
+        path = input_path(day)
+    with cache.use(disk_cache, day, path):
+        if phase == "parse" or parsed is None:
+            parsed = spec.parse(module, path)
+            if phase == "parse":
+                return parsed
+        return getattr(spec, phase)(module, parsed)
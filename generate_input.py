@@ -0,0 +1,27 @@
+import argparse
+import sys
+
+import days
+
+def generate_input(day, size, seed=None, **kwargs):
+    return days.load_day(day, "generate").generate(size, seed, **kwargs)
+
+def write_input(day, size, path, seed=None, **kwargs):
+    with open(path, "w") as f:
+        f.write(generate_input(day, size, seed, **kwargs))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic input for a day.")
+    parser.add_argument("day", type=int, choices=days.ALL_DAYS)
+    parser.add_argument("size", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args(argv)
+    
+    if args.output:
+        write_input(args.day, args.size, args.output, args.seed)
+    else:
+        sys.stdout.write(generate_input(args.day, args.size, args.seed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import mmap
+import os
+import sys
+from stat import S_ISREG
+
+def strip_newline(line):
+    """line without its "\n" and then at most one "\r", as the mapped lines are."""
+    if line.endswith(b"\n"):
+        line = line[:-1]
+    if line.endswith(b"\r"):
+        line = line[:-1]
+    return line
+
+class Input:
+    """An input file, memory-mapped when it is a regular file and streamed
+    otherwise (pipes, a terminal). path "-" is stdin, and path None is
+    input.txt in the working directory, as the days' main.py expect.
+    
+    Used as a context manager:
+        with Input(path) as data:
+            for line in data.lines():
+                ...
+    lines() and blocks() are lazy. On a mapped file they yield memoryviews
+    into the map without copying, which are only valid inside the with block
+    (bytes(view) to keep one). On a stream they yield bytes.
+    """
+    def __init__(self, path=None):
+        self.path = "input.txt" if path is None else path
+        self.file = None
+        self.buffer = None
+    
+    def __enter__(self):
+        if self.path == "-":
+            self.file = sys.stdin.buffer
+        else:
+            self.file = open(self.path, "rb")
+        stat = os.fstat(self.file.fileno())
+        if not S_ISREG(stat.st_mode):
+            # not mappable (pipe, terminal...), stream it instead
+            self.buffer = None
+        elif stat.st_size == 0:
+            # mmap refuses empty files
+            self.buffer = b""
+        else:
+            self.buffer = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self
+    
+    def __exit__(self, *exc_info):
+        if isinstance(self.buffer, mmap.mmap):
+            try:
+                self.buffer.close()
+            except BufferError:
+                # a view escaped the with block, the map is closed once it is released
+                pass
+        self.buffer = None
+        if self.file is not sys.stdin.buffer:
+            self.file.close()
+    
+    def is_mapped(self):
+        return self.buffer is not None
+    
+    def line_spans(self):
+        """(start, end) offsets of each line in the buffer, without the newline."""
+        buffer = self.buffer
+        size = len(buffer)
+        start = 0
+        while start < size:
+            end = buffer.find(b"\n", start)
+            if end == -1:
+                end = size
+            yield start, end
+            start = end + 1
+    
+    def lines(self, keepends=False):
+        if not self.is_mapped():
+            for line in self.file:
+                yield line if keepends else strip_newline(line)
+            return
+        view = memoryview(self.buffer)
+        for start, end in self.line_spans():
+            if keepends:
+                end = min(end+1, len(view))
+            elif end > start and view[end-1] == ord("\r"):
+                end -= 1
+            yield view[start:end]
+    
+    def blocks(self):
+        """Groups of lines separated by blank lines, without the final newline,
+        e.g. the passports of day04 or the tiles of day20.
+        """
+        if not self.is_mapped():
+            block = []
+            for line in self.file:
+                if line.strip():
+                    block.append(line)
+                elif block:
+                    yield strip_newline(b"".join(block))
+                    block = []
+            if block:
+                yield strip_newline(b"".join(block))
+            return
+        view = memoryview(self.buffer)
+        block_start = None
+        block_end = None
+        for start, end in self.line_spans():
+            if self.buffer[start:end].strip():
+                if block_start is None:
+                    block_start = start
+                block_end = end-1 if view[end-1] == ord("\r") else end
+            elif block_start is not None:
+                yield view[block_start:block_end]
+                block_start = None
+        if block_start is not None:
+            yield view[block_start:block_end]
+    
+    def read(self):
+        if self.is_mapped():
+            return bytes(self.buffer)
+        return self.file.read()
+
+def iter_lines(path=None, keepends=False):
+    """Decoded lines of path, streamed with bounded memory."""
+    with Input(path) as data:
+        for line in data.lines(keepends):
+            yield str(line, "utf-8")
+
+def iter_blocks(path=None):
+    with Input(path) as data:
+        for block in data.blocks():
+            yield str(block, "utf-8")
@@ -0,0 +1,333 @@
+import argparse
+import collections
+import contextlib
+import cProfile
+import functools
+import gc
+import os
+import resource
+import signal
+import sys
+import time
+import tracemalloc
+
+import days
+
+PhaseStats = collections.namedtuple("PhaseStats", ["runs", "wall", "cpu", "calls",
+                                                   "peak", "retained", "rss_peak"],
+                                    defaults=[None, None, None])
+CacheGrowth = collections.namedtuple("CacheGrowth", ["phase", "cache", "before", "after", "maxsize"])
+
+# Functions worth counting calls of, by day. Dotted names are looked up in the day's module.
+HOT_FUNCTIONS = {
+    4: ["extract_passports", "iter_passports", "is_all_fields_present", "is_valid_fields",
+        "validate_many"],
+    7: ["BagGraph.num_contained", "BagGraph.possible_origins", "BagGraph.contents"],
+    8: ["check_termination"],
+    11: ["get_neighbours", "SeatSimulation.compute_sight", "SeatSimulation.next_iter"],
+    14: ["MaskInst.apply", "MaskInst.apply_float"],
+    16: ["Field.valid", "possibly_valid_ticket"],
+    17: ["get_neighbourhood", "is_cube_active_in_next_state"],
+    18: ["parse_line", "shunting_yard_convert", "shunting_yard_evaluate"],
+    19: ["matchrule", "Rule.substitute"],
+    20: ["OrientedTile.check_fit", "Map.check_fit", "find_fittable", "orient_grid"],
+}
+
+def resolve(module, dotted_name):
+    owner = module
+    *path, name = dotted_name.split(".")
+    for part in path:
+        owner = getattr(owner, part)
+    return owner, name
+
+def counting_wrapper(func, key, counts):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        counts[key] += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+@contextlib.contextmanager
+def count_calls(module, dotted_names, counts):
+    """Counts calls of module functions/methods into counts while active.
+    The originals are patched back on exit, so nothing is left behind when
+    profiling is off.
+    """
+    patched = []
+    try:
+        for dotted_name in dotted_names:
+            owner, name = resolve(module, dotted_name)
+            original = vars(owner)[name]
+            if isinstance(original, (staticmethod, classmethod)):
+                wrapped = type(original)(counting_wrapper(original.__func__, dotted_name, counts))
+            else:
+                wrapped = counting_wrapper(original, dotted_name, counts)
+            setattr(owner, name, wrapped)
+            patched.append((owner, name, original))
+        yield counts
+    finally:
+        for owner, name, original in reversed(patched):
+            setattr(owner, name, original)
+
+def find_caches(module):
+    """{dotted name: functools.lru_cache wrapper} for the module and its classes."""
+    caches = {}
+    for name, value in vars(module).items():
+        if hasattr(value, "cache_info"):
+            caches[name] = value
+        elif isinstance(value, type) and value.__module__ == module.__name__:
+            for attr, member in vars(value).items():
+                if hasattr(member, "cache_info"):
+                    caches[f"{name}.{attr}"] = member
+    return caches
+
+def reset_rss_peak():
+    """Resets the peak RSS (VmHWM) of this process. Linux only, returns
+    False where it isn't supported, and the peak is then process-wide.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+def rss_peak():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+def format_bytes(num):
+    for unit in ("B", "KiB", "MiB"):
+        if abs(num) < 1024:
+            return f"{num:.1f}{unit}"
+        num /= 1024
+    return f"{num:.1f}GiB"
+
+class StackSampler:
+    """Samples the Python stack on SIGPROF (CPU time) and counts
+    collapsed stacks, the input format of flamegraph.pl / speedscope.
+    Unix only, and must run in the main thread.
+    """
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.previous_handler = None
+    
+    def sample(self, signum, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            filename = os.path.relpath(code.co_filename, days.ROOT)
+            stack.append(f"{code.co_name} ({filename}:{code.co_firstlineno})")
+            frame = frame.f_back
+        self.stacks[";".join(reversed(stack))] += 1
+    
+    def __enter__(self):
+        self.previous_handler = signal.signal(signal.SIGPROF, self.sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return self
+    
+    def __exit__(self, *exc_info):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self.previous_handler)
+    
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class Profiler:
+    """Records wall/CPU time and hot function call counts per named phase.
+    Optionally writes <phase>.prof (cProfile) to cprofile_dir and
+    <phase>.collapsed (sampled stacks) to collapsed_dir.
+    
+    With track_memory, also records per phase the tracemalloc peak and the
+    bytes still allocated once the phase is over (e.g. held by caches),
+    the peak RSS, and the growth of watched lru_caches. tracemalloc slows
+    everything down, so times are inflated in this mode.
+    
+    With enabled=False, phase() does nothing and profiled() returns the
+    function unchanged.
+    """
+    def __init__(self, enabled=True, cprofile_dir=None, collapsed_dir=None,
+                 sample_interval=0.001, track_memory=False):
+        self.enabled = enabled
+        self.cprofile_dir = cprofile_dir
+        self.collapsed_dir = collapsed_dir
+        self.sample_interval = sample_interval
+        self.track_memory = track_memory
+        self.counts = collections.Counter()
+        self.caches = {}
+        self.cache_growth = []
+        self.phases = {}
+    
+    def watch_caches(self, module):
+        for name, cache in find_caches(module).items():
+            self.caches[f"{module.__name__}.{name}"] = cache
+    
+    def cache_sizes(self):
+        return {name: cache.cache_info().currsize for name, cache in self.caches.items()}
+    
+    @contextlib.contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        
+        profile = cProfile.Profile() if self.cprofile_dir else None
+        sampler = StackSampler(self.sample_interval) if self.collapsed_dir else None
+        counts_before = self.counts.copy()
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            gc.collect()
+            cache_sizes_before = self.cache_sizes()
+            memory_before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            rss_resettable = reset_rss_peak()
+        with sampler or contextlib.nullcontext():
+            if profile:
+                profile.enable()
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            try:
+                yield
+            finally:
+                cpu = time.process_time() - cpu_start
+                wall = time.perf_counter() - wall_start
+                if profile:
+                    profile.disable()
+        
+        calls = self.counts - counts_before
+        stats = PhaseStats(1, wall, cpu, calls)
+        if self.track_memory:
+            peak = tracemalloc.get_traced_memory()[1] - memory_before
+            gc.collect()
+            retained = tracemalloc.get_traced_memory()[0] - memory_before
+            stats = stats._replace(peak=peak, retained=retained,
+                                   rss_peak=rss_peak() if rss_resettable else None)
+            for cache_name, size in self.cache_sizes().items():
+                if size > cache_sizes_before[cache_name]:
+                    self.cache_growth.append(CacheGrowth(
+                        name, cache_name, cache_sizes_before[cache_name], size,
+                        self.caches[cache_name].cache_info().maxsize))
+        
+        if name in self.phases:
+            previous = self.phases[name]
+            stats = PhaseStats(
+                previous.runs+1, previous.wall+wall, previous.cpu+cpu, previous.calls+calls,
+                None if stats.peak is None else max(previous.peak, stats.peak),
+                None if stats.retained is None else previous.retained + stats.retained,
+                None if stats.rss_peak is None else max(previous.rss_peak, stats.rss_peak))
+        self.phases[name] = stats
+        
+        if profile:
+            os.makedirs(self.cprofile_dir, exist_ok=True)
+            profile.dump_stats(os.path.join(self.cprofile_dir, f"{name}.prof"))
+        if sampler:
+            os.makedirs(self.collapsed_dir, exist_ok=True)
+            sampler.write(os.path.join(self.collapsed_dir, f"{name}.collapsed"))
+    
+    def profiled(self, name=None):
+        """Decorator form of phase(), named after the function by default."""
+        def decorator(func):
+            if not self.enabled:
+                return func
+            phase_name = name or func.__qualname__
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.phase(phase_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+    
+    def count_calls(self, module, dotted_names):
+        if not self.enabled:
+            return contextlib.nullcontext(self.counts)
+        return count_calls(module, dotted_names, self.counts)
+    
+    def report(self):
+        lines = []
+        for name, stats in self.phases.items():
+            lines.append(f"{name:<14} wall {stats.wall:10.6f}s cpu {stats.cpu:10.6f}s"
+                         f" ({stats.runs} runs)")
+            if stats.peak is not None:
+                rss = "" if stats.rss_peak is None else f" rss peak {format_bytes(stats.rss_peak)}"
+                lines.append(f"    memory peak {format_bytes(stats.peak)}"
+                             f" retained {format_bytes(stats.retained)}{rss}")
+            for func_name, count in stats.calls.most_common():
+                lines.append(f"    {func_name:<32} {count:>12} calls")
+        
+        if self.track_memory:
+            lines.append(f"process rss peak {format_bytes(rss_peak())}")
+        # an unbounded cache that grows on every run of a phase is never reused
+        growth_by_cache = collections.defaultdict(list)
+        for growth in self.cache_growth:
+            growth_by_cache[(growth.phase, growth.cache)].append(growth)
+        for (phase, cache), growths in growth_by_cache.items():
+            sizes = " -> ".join(str(g.after) for g in growths)
+            unbounded = growths[-1].maxsize is None
+            if len(growths) > 1 and unbounded:
+                flag = "WARNING: unbounded cache keeps growing across runs"
+            elif unbounded:
+                flag = "unbounded"
+            else:
+                flag = f"maxsize {growths[-1].maxsize}"
+            lines.append(f"cache {cache} grew in {phase}: {growths[0].before} -> {sizes} ({flag})")
+        return "\n".join(lines)
+
+def profile_day(profiler, day, phases=days.PHASES, path=None, count=()):
+    module = days.load_day(day)
+    spec = days.SPECS[day]
+    if path is None:
+        path = days.input_path(day)
+    
+    profiler.watch_caches(module)
+    with profiler.count_calls(module, list(HOT_FUNCTIONS.get(day, [])) + list(count)):
+        for phase in phases:
+            if phase == "parse":
+                arg = path
+            else:
+                arg = spec.parse(module, path)
+            with profiler.phase(f"day{day:02}.{phase}"):
+                getattr(spec, phase)(module, arg)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the phases of some days.")
+    parser.add_argument("days", nargs="+", type=int)
+    parser.add_argument("--phases", nargs="+", choices=days.PHASES, default=list(days.PHASES))
+    parser.add_argument("--input", help="input file to use instead of dayNN/input.txt")
+    parser.add_argument("--count", nargs="+", default=[], metavar="NAME",
+                        help="extra functions to count calls of, e.g. SeatSimulation.get_seat")
+    parser.add_argument("--cprofile", metavar="DIR", help="write a .prof file per phase here")
+    parser.add_argument("--collapsed", metavar="DIR",
+                        help="write sampled collapsed stacks per phase here")
+    parser.add_argument("--interval", type=float, default=0.001,
+                        help="sampling interval in seconds for --collapsed")
+    parser.add_argument("--memory", action="store_true",
+                        help="track peak/retained memory and cache growth (slow)")
+    parser.add_argument("--runs", type=int, default=1,
+                        help="profile each day this many times, e.g. to see caches grow")
+    args = parser.parse_args(argv)
+    
+    if args.input and len(args.days) != 1:
+        parser.error("--input requires exactly one day")
+    if args.count and len(args.days) != 1:
+        parser.error("--count requires exactly one day")
+    
+    profiler = Profiler(cprofile_dir=args.cprofile, collapsed_dir=args.collapsed,
+                        sample_interval=args.interval, track_memory=args.memory)
+    for day in args.days:
+        for i in range(args.runs):
+            profile_day(profiler, day, args.phases, args.input, args.count)
+    print(profiler.report())
+
+if __name__ == "__main__":
+    main()
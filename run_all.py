@@ -0,0 +1,93 @@
+import argparse
+import concurrent.futures
+import json
+import os
+import time
+
+import cache
+import days
+
+PARTS = ("part1", "part2")
+DEFAULT_TIMINGS = os.path.join(days.ROOT, "timings.json")
+
+def run_job(day, part, use_cache=True):
+    start = time.perf_counter()
+    value = days.run_phase(day, part, disk_cache=cache.DiskCache() if use_cache else None)
+    return value, time.perf_counter() - start
+
+def load_timings(path):
+    """{(day, part): seconds} from a benchmark.py --json report
+    (or one written by --record). Timings of generated inputs are ignored.
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        report = json.load(f)
+    timings = {}
+    for result in report["results"]:
+        if result.get("size") is not None:
+            continue
+        timings[(result["day"], result["phase"])] = result["median"]
+    # every part job parses its own input
+    for day, phase in list(timings):
+        if phase in PARTS:
+            timings[(day, phase)] += timings.get((day, "parse"), 0)
+    return timings
+
+def schedule(jobs, timings):
+    """Longest job first. Jobs without a recorded time go first of all,
+    since they could be the longest.
+    """
+    return sorted(jobs, key=lambda job: -timings.get(job, float("inf")))
+
+def record_timings(path, durations):
+    results = [{"day": day, "phase": part, "size": None, "median": seconds}
+               for (day, part), seconds in sorted(durations.items())]
+    with open(path, "w") as f:
+        json.dump({"results": results}, f, indent=2)
+
+def run_all(day_list, max_workers=None, timings=None, use_cache=True):
+    """Runs part1 and part2 of every day in a process pool.
+    Yields (day, part, value, seconds) in day order as results become available.
+    """
+    jobs = [(day, part) for day in day_list for part in PARTS]
+    results = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(run_job, *job, use_cache): job
+                   for job in schedule(jobs, timings or {})}
+        next_index = 0
+        for future in concurrent.futures.as_completed(futures):
+            results[futures[future]] = future.result()
+            while next_index < len(jobs) and jobs[next_index] in results:
+                day, part = jobs[next_index]
+                value, seconds = results[(day, part)]
+                yield day, part, value, seconds
+                next_index += 1
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run every day concurrently.")
+    parser.add_argument("days", nargs="*", type=int, default=list(days.ALL_DAYS))
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of worker processes (default: cpu count)")
+    parser.add_argument("--timings", default=DEFAULT_TIMINGS,
+                        help="benchmark.py --json report used to schedule longest jobs first")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="recompute intermediates instead of using the cache in .cache/")
+    parser.add_argument("--record", action="store_true",
+                        help="save this run's job times to --timings for the next run")
+    args = parser.parse_args(argv)
+    
+    start = time.perf_counter()
+    durations = {}
+    results = run_all(args.days, args.jobs, load_timings(args.timings), not args.no_cache)
+    for day, part, value, seconds in results:
+        durations[(day, part)] = seconds
+        print(f"day{day:02} {part}: {value} ({seconds:.3f}s)", flush=True)
+    end = time.perf_counter()
+    print(f"Took {end - start}s (sum of jobs {sum(durations.values())}s)")
+    
+    if args.record:
+        record_timings(args.timings, durations)
+
+if __name__ == "__main__":
+    main()
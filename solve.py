@@ -0,0 +1,57 @@
+import argparse
+import base64
+import json
+import socket
+import sys
+import time
+
+import loader
+import solver_daemon
+
+def request_solutions(socket_path, requests):
+    """Sends the requests to a running solver_daemon.py, returns the responses."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        with sock.makefile("rwb") as f:
+            for request in requests:
+                f.write(json.dumps(request).encode() + b"\n")
+            f.flush()
+            return [json.loads(f.readline()) for _ in requests]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Solve a day through the solver daemon, like running its main.py.")
+    parser.add_argument("day", type=int)
+    parser.add_argument("input", nargs="?", help="input file, - for stdin (default: dayNN/input.txt)")
+    parser.add_argument("--part", type=int, nargs="+", choices=(1, 2), default=[1, 2])
+    parser.add_argument("--socket", default=solver_daemon.DEFAULT_SOCKET)
+    args = parser.parse_args(argv)
+    
+    start = time.time()
+    input_bytes = None
+    if args.input:
+        with loader.Input(args.input) as data:
+            input_bytes = data.read()
+    encoded = None if input_bytes is None else base64.b64encode(input_bytes).decode()
+    requests = [{"day": args.day, "part": part, "input": encoded} for part in args.part]
+    
+    try:
+        responses = request_solutions(args.socket, requests)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"No solver daemon at {args.socket}, solving locally", file=sys.stderr)
+        responses = []
+        for part in args.part:
+            value, seconds = solver_daemon.solve(args.day, f"part{part}", input_bytes)
+            responses.append({"ok": True, "value": value, "seconds": seconds})
+    
+    for part, response in zip(args.part, responses):
+        if not response["ok"]:
+            print(f"part{part}: error: {response['error']}", file=sys.stderr)
+            sys.exit(1)
+        print(f"part{part}: {response['value']}")
+    
+    end = time.time()
+    print(f"Took {end - start}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import argparse
+import asyncio
+import base64
+import concurrent.futures
+import contextlib
+import json
+import os
+import tempfile
+import time
+
+import cache
+import days
+import run_all
+
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), f"aoc2020-solver-{os.getuid()}.sock")
+# jobs recorded as faster than this run on the event loop instead of in the pool
+INLINE_SECONDS = 0.01
+
+def preload():
+    for day in days.ALL_DAYS:
+        days.load_day(day)
+
+def solve(day, part, input_bytes, use_cache=True):
+    """Solves one part on the given input. Returns (value as str, seconds)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = None
+        if input_bytes is not None:
+            path = os.path.join(tmp, "input.txt")
+            with open(path, "wb") as f:
+                f.write(input_bytes)
+        start = time.perf_counter()
+        value = days.run_phase(day, part, path,
+                               disk_cache=cache.DiskCache() if use_cache else None)
+        seconds = time.perf_counter() - start
+    return str(value), seconds
+
+def parse_request(request):
+    day = int(request["day"])
+    if day not in days.ALL_DAYS:
+        raise ValueError(f"no such day: {day}")
+    part = f"part{int(request['part'])}"
+    if part not in run_all.PARTS:
+        raise ValueError(f"no such part: {request['part']}")
+    input_bytes = None
+    if request.get("input") is not None:
+        input_bytes = base64.b64decode(request["input"])
+    return day, part, input_bytes
+
+class SolverServer:
+    """Serves newline-delimited JSON requests
+        {"day": 7, "part": 1, "input": <base64 bytes, or null for input.txt>}
+    with responses
+        {"ok": true, "value": "268", "seconds": 0.003, "total_seconds": 0.004}
+    or {"ok": false, "error": "..."}. {"command": "shutdown"} stops the server.
+    """
+    def __init__(self, socket_path=DEFAULT_SOCKET, max_workers=None, timings=None,
+                 use_cache=True):
+        self.socket_path = socket_path
+        self.timings = timings or {}
+        self.use_cache = use_cache
+        self.max_workers = max_workers or os.cpu_count()
+        self.executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers,
+                                                               initializer=preload)
+        self.stopped = None
+    
+    def runs_inline(self, day, part, input_bytes):
+        # recorded timings are for input.txt only
+        if input_bytes is not None:
+            return False
+        return self.timings.get((day, part), float("inf")) < INLINE_SECONDS
+    
+    async def handle_request(self, request):
+        if request.get("command") == "shutdown":
+            self.stopped.set()
+            return {"ok": True}
+        start = time.perf_counter()
+        day, part, input_bytes = parse_request(request)
+        if self.runs_inline(day, part, input_bytes):
+            value, seconds = solve(day, part, input_bytes, self.use_cache)
+        else:
+            loop = asyncio.get_running_loop()
+            value, seconds = await loop.run_in_executor(
+                self.executor, solve, day, part, input_bytes, self.use_cache)
+        return {"ok": True, "value": value, "seconds": seconds,
+                "total_seconds": time.perf_counter() - start}
+    
+    async def handle_connection(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self.handle_request(json.loads(line))
+                except Exception as e:
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except (asyncio.CancelledError, ConnectionError):
+            # the server shut down with this connection open, or the client went away
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+    
+    async def serve(self):
+        preload()
+        # start the workers (and their imports) now rather than on the first request
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.executor, time.sleep, 0)
+                               for _ in range(self.max_workers)))
+        self.stopped = asyncio.Event()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        server = await asyncio.start_unix_server(self.handle_connection, self.socket_path)
+        try:
+            async with server:
+                await self.stopped.wait()
+        finally:
+            self.executor.shutdown()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve solutions from warm processes.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of worker processes (default: cpu count)")
+    parser.add_argument("--timings", default=run_all.DEFAULT_TIMINGS,
+                        help="benchmark.py --json report used to pick jobs cheap enough to run inline")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+    
+    server = SolverServer(args.socket, args.jobs, run_all.load_timings(args.timings),
+                          not args.no_cache)
+    print(f"Listening on {args.socket}", flush=True)
+    asyncio.run(server.serve())
+
+if __name__ == "__main__":
+    main()